@@ -0,0 +1,90 @@
+"""Benchmark re-sending the same notification to different targets.
+
+Run with `python -m benchmarks.cache`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from functools import partial
+import json
+import timeit
+
+from letmeknowclient import (
+    LMKClient,
+    LMKClientConfig,
+    LMKClientType,
+    LMKError,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSNotification,
+    LMKWSRequestType,
+    get_json_codec,
+)
+from letmeknowclient.codec import CODEC_JSON, CODECS
+
+NUMBER = 100_000
+
+NOTIFICATION = LMKNotification(
+    type="status",
+    title="Heartbeat",
+    subtitle="nas-01",
+    content="All services running",
+    image=LMKNotificationImage(url="https://example.com/ok.png"),
+    timeout=5000,
+)
+TARGETS = [["client-*"], ["headless-*"], ["client-1", "client-2"]]
+
+
+def _client(config: LMKClientConfig) -> LMKClient:
+    """Create a client to encode with."""
+    return LMKClient("localhost", 8080, LMKClientType.HEADLESS, "bench", config=config)
+
+
+def _encode(client: LMKClient, targets: list[str]) -> str:
+    """Encode the notification frame, as sent by ws_send_notification."""
+    return client._encode_notification(NOTIFICATION, targets)  # noqa: SLF001 # pylint: disable=protected-access
+
+
+def _broadcast(client: LMKClient) -> None:
+    """Encode the notification for each target group."""
+    for targets in TARGETS:
+        _encode(client, targets)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for name in CODECS:
+        try:
+            codec = get_json_codec(name)
+        except LMKError:
+            print(f"{name:<8} not installed")
+            continue
+
+        config = LMKClientConfig(json_codec=codec)
+        client = _client(config)
+
+        if name == CODEC_JSON:
+            frame = LMKWSNotification(
+                type=LMKWSRequestType.NOTIFICATION,
+                data=NOTIFICATION,
+                targets=TARGETS[0],
+            )
+            if _encode(client, TARGETS[0]) != json.dumps(frame.to_dict()):
+                msg = "Cached frame differs from json.dumps"
+                raise AssertionError(msg)
+
+        cached = timeit.timeit(partial(_broadcast, client), number=NUMBER)
+        client = _client(replace(config, frame_cache_size=0))
+        uncached = timeit.timeit(partial(_broadcast, client), number=NUMBER)
+
+        per_send = NUMBER * len(TARGETS) / 1e6
+        print(
+            f"{name:<8} uncached {uncached / per_send:5.2f}us"
+            f"  cached {cached / per_send:5.2f}us"
+            f"  speedup {uncached / cached:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark the JSON codecs on websocket frames.
+
+Run with `python -m benchmarks.codec`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from importlib.util import find_spec
+import timeit
+
+from letmeknowclient import (
+    TARGETS_ALL_CLIENTS,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSNotification,
+    LMKWSRequestType,
+    get_json_codec,
+)
+from letmeknowclient.codec import CODECS
+
+NUMBER = 100_000
+
+FRAME = LMKWSNotification(
+    type=LMKWSRequestType.NOTIFICATION,
+    data=LMKNotification(
+        type="notification",
+        title="Backup finished",
+        subtitle="nas-01",
+        content="Nightly backup completed in 12 minutes",
+        image=LMKNotificationImage(url="https://example.com/backup.png"),
+        timeout=5000,
+    ),
+    targets=TARGETS_ALL_CLIENTS,
+).to_dict()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    baseline: float | None = None
+
+    for name in reversed(CODECS):
+        if name != "json" and find_spec(name) is None:
+            print(f"{name:<8} not installed")
+            continue
+
+        codec = get_json_codec(name)
+        text = codec.dumps(FRAME)
+
+        encode = timeit.timeit(partial(codec.dumps, FRAME), number=NUMBER)
+        decode = timeit.timeit(partial(codec.loads, text), number=NUMBER)
+        total = encode + decode
+
+        if baseline is None:
+            baseline = total
+
+        print(
+            f"{name:<8} encode {encode / NUMBER * 1e6:6.2f}us"
+            f"  decode {decode / NUMBER * 1e6:6.2f}us"
+            f"  speedup {baseline / total:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare full and compact notification frames.
+
+Run with `python -m benchmarks.compact`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+import timeit
+from typing import TYPE_CHECKING
+
+from letmeknowclient import (
+    TARGETS_ALL_CLIENTS,
+    LMKJSONCodec,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSNotification,
+    LMKWSRequestType,
+    get_json_codec,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+NUMBER = 100_000
+REPEAT = 5
+
+FRAMES = {
+    "title": LMKNotification(title="Ping"),
+    "title+content": LMKNotification(
+        title="Disk space low",
+        content="/var is 91% full",
+    ),
+    "full": LMKNotification(
+        type="notification",
+        title="Backup finished",
+        subtitle="nas-01",
+        content="Nightly backup completed in 12 minutes",
+        image=LMKNotificationImage(url="https://example.com/backup.png"),
+        timeout=5000,
+    ),
+}
+
+
+def _best(stmt: Callable[[], object], number: int) -> float:
+    """Time a statement, keeping the fastest of several runs."""
+    return min(timeit.repeat(stmt, number=number, repeat=REPEAT))
+
+
+def _dumps(codec: LMKJSONCodec, frame: LMKWSNotification, *, compact: bool) -> str:
+    """Encode a frame with a codec, through to_dict."""
+    return codec.dumps(frame.to_dict(compact=compact))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    codec = get_json_codec()
+    print(f"codec: {codec.name}")
+
+    for name, notification in FRAMES.items():
+        frame = LMKWSNotification(
+            type=LMKWSRequestType.NOTIFICATION,
+            data=notification,
+            targets=TARGETS_ALL_CLIENTS,
+        )
+        full = frame.to_json()
+        compact = frame.to_json(compact=True)
+
+        full_time = _best(partial(frame.to_json, compact=False), number=NUMBER)
+        compact_time = _best(partial(frame.to_json, compact=True), number=NUMBER)
+        full_dict_time = _best(
+            partial(_dumps, codec, frame, compact=False), number=NUMBER
+        )
+        compact_dict_time = _best(
+            partial(_dumps, codec, frame, compact=True), number=NUMBER
+        )
+        full_decode = _best(partial(codec.loads, full), number=NUMBER)
+        compact_decode = _best(partial(codec.loads, compact), number=NUMBER)
+
+        print(
+            f"{name:<14} size {len(full):4d}B -> {len(compact):4d}B"
+            f" ({len(compact) / len(full):4.0%})"
+            f"  encode {full_time / NUMBER * 1e6:5.2f}us"
+            f" -> {compact_time / NUMBER * 1e6:5.2f}us"
+            f"  dict encode {full_dict_time / NUMBER * 1e6:5.2f}us"
+            f" -> {compact_dict_time / NUMBER * 1e6:5.2f}us"
+            f"  decode {full_decode / NUMBER * 1e6:5.2f}us"
+            f" -> {compact_decode / NUMBER * 1e6:5.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark the time from connecting to the first acknowledged send.
+
+Compares `ws_connect` followed by `ws_register` with `connect`, which sends
+the register frame without waiting for its response.
+
+Run with `python -m benchmarks.connect`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from letmeknowclient import (
+    TARGETS_ALL_HEADLESS,
+    LMKClient,
+    LMKClientType,
+    LMKNotification,
+    LMKWSResponseType,
+    generate_user_id,
+)
+from letmeknowclient.server import LMKTestServer
+
+NUMBER = 500
+
+NOTIFICATION = LMKNotification(type="status", title="Connected")
+
+
+async def _sequential(client: LMKClient) -> None:
+    """Connect, register, then send."""
+    await client.ws_connect()
+    await client.ws_register()
+    await client.ws_send_notification(NOTIFICATION, TARGETS_ALL_HEADLESS)
+
+
+async def _pipelined(client: LMKClient) -> None:
+    """Connect with the register frame pipelined, then send."""
+    await client.connect()
+    await client.ws_send_notification(NOTIFICATION, TARGETS_ALL_HEADLESS)
+    if (await client.ws_wait_registered()).type != LMKWSResponseType.REGISTER:
+        msg = "Failed to register"
+        raise AssertionError(msg)
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    async with LMKTestServer() as server:
+        for name, run in (("sequential", _sequential), ("pipelined", _pipelined)):
+            timings = []
+            for _ in range(NUMBER):
+                async with LMKClient(
+                    server.host,
+                    server.port,
+                    LMKClientType.CLIENT,
+                    generate_user_id(LMKClientType.CLIENT),
+                ) as client:
+                    start = time.perf_counter()
+                    await run(client)
+                    timings.append(time.perf_counter() - start)
+
+            print(
+                f"{name:<10} first send mean {statistics.fmean(timings) * 1e3:5.2f}ms"
+                f"  p50 {statistics.median(timings) * 1e3:5.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+"""End-to-end throughput and latency benchmark against the stand-in server.
+
+Run with `python -m benchmarks.e2e --senders 4 --listeners 4`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession
+
+from letmeknowclient import (
+    TARGETS_ALL_HEADLESS,
+    LMKClient,
+    LMKClientType,
+    LMKNotification,
+    LMKWSBatchResult,
+    LMKWSResponseType,
+    generate_user_id,
+)
+from letmeknowclient.server import LMKTestServer
+from letmeknowclient.utils import percentile
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@dataclass(slots=True)
+class Args:
+    """Arguments for the benchmark."""
+
+    senders: int = 4
+    listeners: int = 4
+    count: int = 5000
+    window: int = 64
+
+
+def interpret_args() -> Args:
+    """Interpret the arguments from the command line.
+
+    Returns
+    -------
+        Args: The arguments.
+
+    """
+    parser = argparse.ArgumentParser(description="End-to-end LetMeKnow benchmark")
+    parser.add_argument("--senders", type=int, default=4, help="Sender connections")
+    parser.add_argument("--listeners", type=int, default=4, help="Listener connections")
+    parser.add_argument("--count", type=int, default=5000, help="Sends per sender")
+    parser.add_argument("--window", type=int, default=64, help="Sends in flight")
+    args = parser.parse_args()
+
+    return Args(
+        senders=args.senders,
+        listeners=args.listeners,
+        count=args.count,
+        window=args.window,
+    )
+
+
+async def _connect(
+    session: ClientSession,
+    server: LMKTestServer,
+    client_type: LMKClientType,
+) -> LMKClient:
+    """Connect and register a client with the server."""
+    client = LMKClient(
+        lmk_host=server.host,
+        lmk_port=server.port,
+        lmk_client_type=client_type,
+        lmk_user_id=generate_user_id(client_type),
+        session=session,
+    )
+    await client.ws_connect()
+    if (response := await client.ws_register()).type != LMKWSResponseType.REGISTER:
+        msg = f"Failed to register: {response}"
+        raise RuntimeError(msg)
+    return client
+
+
+@dataclass(slots=True)
+class Deliveries:
+    """Latencies of the notifications delivered to the listeners."""
+
+    expected: int
+    latencies: list[float] = field(default_factory=list)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def received(self, notification: LMKNotification) -> None:
+        """Record the latency of a notification sent with its send time."""
+        self.latencies.append(time.perf_counter_ns() - int(notification.content or 0))
+        if len(self.latencies) >= self.expected:
+            self.done.set()
+
+
+def _notifications(count: int) -> Iterator[tuple[LMKNotification, list[str] | None]]:
+    """Create notifications to all listeners, holding their send time."""
+    for index in range(count):
+        yield (
+            LMKNotification(title=str(index), content=str(time.perf_counter_ns())),
+            TARGETS_ALL_HEADLESS,
+        )
+
+
+async def _send(
+    senders: list[LMKClient],
+    args: Args,
+) -> tuple[list[LMKWSBatchResult], float]:
+    """Send from every sender at once, returning the results and the duration."""
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            sender.ws_send_notifications(_notifications(args.count), window=args.window)
+            for sender in senders
+        )
+    )
+    return results, time.perf_counter() - start
+
+
+def _report(
+    args: Args,
+    results: list[LMKWSBatchResult],
+    send_elapsed: float,
+    deliveries: Deliveries,
+) -> None:
+    """Print the results of the benchmark."""
+    sent = sum(len(result.responses) for result in results)
+    failed = sum(len(result.responses) - result.succeeded for result in results)
+    latencies_ms = [latency / 1e6 for latency in deliveries.latencies]
+
+    print(f"senders {args.senders}  listeners {args.listeners}  window {args.window}")
+    print(f"sent      {sent} in {send_elapsed:.2f}s ({sent / send_elapsed:,.0f}/s)")
+    print(f"failed    {failed}")
+    print(f"delivered {len(latencies_ms)}/{deliveries.expected}")
+    print(
+        f"latency   p50 {percentile(latencies_ms, 50):.2f}ms"
+        f"  p99 {percentile(latencies_ms, 99):.2f}ms"
+        f"  max {max(latencies_ms, default=0):.2f}ms"
+    )
+
+
+async def run(args: Args) -> None:
+    """Run the benchmark."""
+    deliveries = Deliveries(expected=args.senders * args.count * args.listeners)
+
+    async with LMKTestServer() as server, ClientSession() as session:
+        listeners = [
+            await _connect(session, server, LMKClientType.HEADLESS)
+            for _ in range(args.listeners)
+        ]
+        senders = [
+            await _connect(session, server, LMKClientType.CLIENT)
+            for _ in range(args.senders)
+        ]
+        listen_tasks = [
+            asyncio.create_task(
+                listener.ws_listen_for_notifications(deliveries.received)
+            )
+            for listener in listeners
+        ]
+
+        results, send_elapsed = await _send(senders, args)
+
+        try:
+            async with asyncio.timeout(30):
+                await deliveries.done.wait()
+        except TimeoutError:
+            print(
+                f"Timed out with {len(deliveries.latencies)}/{deliveries.expected}"
+                " deliveries"
+            )
+
+        for client in (*senders, *listeners):
+            await client.ws_close()
+        await asyncio.gather(*listen_tasks)
+
+    _report(args, results, send_elapsed, deliveries)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(interpret_args()))
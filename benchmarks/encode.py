@@ -0,0 +1,67 @@
+"""Benchmark encoding notification frames.
+
+Run with `python -m benchmarks.encode`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+import json
+import timeit
+
+from letmeknowclient import (
+    TARGETS_ALL_CLIENTS,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSNotification,
+    LMKWSRequestType,
+)
+
+NUMBER = 100_000
+
+FRAMES = {
+    "minimal": LMKWSNotification(
+        type=LMKWSRequestType.NOTIFICATION,
+        data=LMKNotification(title="Ping"),
+        targets=TARGETS_ALL_CLIENTS,
+    ),
+    "full": LMKWSNotification(
+        type=LMKWSRequestType.NOTIFICATION,
+        data=LMKNotification(
+            type="notification",
+            title="Backup finished \N{CHECK MARK}",
+            subtitle="nas-01",
+            content='Nightly backup "daily" completed\nin 12 minutes',
+            image=LMKNotificationImage(url="https://example.com/backup.png"),
+            timeout=5000,
+        ),
+        targets=["client-1", "client-2", "headless-*"],
+    ),
+}
+
+
+def _dumps_dict(frame: LMKWSNotification, *, compact: bool = False) -> str:
+    """Encode a frame through to_dict and json.dumps."""
+    return json.dumps(frame.to_dict(compact=compact))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for name, frame in FRAMES.items():
+        for compact in (False, True):
+            if frame.to_json(compact=compact) != _dumps_dict(frame, compact=compact):
+                msg = f"to_json output differs from json.dumps for {name}"
+                raise AssertionError(msg)
+
+        dumps = timeit.timeit(partial(_dumps_dict, frame), number=NUMBER)
+        direct = timeit.timeit(frame.to_json, number=NUMBER)
+
+        print(
+            f"{name:<8} to_dict+json.dumps {dumps / NUMBER * 1e6:6.2f}us"
+            f"  to_json {direct / NUMBER * 1e6:6.2f}us"
+            f"  speedup {dumps / direct:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark the validating and trusted from_dict of each model.
+
+Run with `python -m benchmarks.from_dict`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+import timeit
+from typing import Any
+
+from letmeknowclient import (
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSNotification,
+    LMKWSRegister,
+    LMKWSResponseError,
+    LMKWSResponseSuccess,
+)
+
+NUMBER = 200_000
+
+NOTIFICATION: dict[str, Any] = {
+    "type": "status",
+    "title": "Heartbeat",
+    "subtitle": "nas-01",
+    "content": "All services running",
+    "image": {"url": "https://example.com/ok.png"},
+    "timeout": 5000,
+}
+
+CASES: tuple[tuple[Any, dict[str, Any]], ...] = (
+    (LMKNotification, NOTIFICATION),
+    (LMKNotificationImage, {"url": "https://example.com/ok.png"}),
+    (LMKWSRegister, {"type": "register", "userID": "headless-1"}),
+    (
+        LMKWSNotification,
+        {"type": "notification", "data": NOTIFICATION, "targets": ["headless-*"]},
+    ),
+    (
+        LMKWSResponseError,
+        {"type": "error", "message": "Invalid target", "error": "BadRequest"},
+    ),
+    (
+        LMKWSResponseSuccess,
+        {"type": "notificationSent", "succeeded": True, "message": "Sent"},
+    ),
+)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for model, data in CASES:
+        if model.from_dict(data) != model.from_dict_trusted(data):
+            msg = f"Trusted decode of {model.__name__} differs"
+            raise AssertionError(msg)
+
+        checked = timeit.timeit(partial(model.from_dict, data), number=NUMBER)
+        trusted = timeit.timeit(partial(model.from_dict_trusted, data), number=NUMBER)
+
+        print(
+            f"{model.__name__:<22} from_dict {checked / NUMBER * 1e6:5.2f}us"
+            f"  trusted {trusted / NUMBER * 1e6:5.2f}us"
+            f"  speedup {checked / trusted:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark eager and lazy decoding of received notifications.
+
+Run with `python -m benchmarks.lazy`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+import timeit
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from letmeknowclient import (
+    LMKLazyNotification,
+    LMKNotification,
+    LMKWSNotification,
+    get_json_codec,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+NUMBER = 100_000
+
+FRAME = get_json_codec().loads(
+    '{"type": "notification", "data": {"type": "status", "title": "Heartbeat",'
+    ' "subtitle": "nas-01", "content": "All services running",'
+    ' "image": {"url": "https://example.com/ok.png"}, "timeout": 5000},'
+    ' "targets": ["headless-*"]}'
+)
+
+
+def _eager(frame: dict[str, Any]) -> LMKNotification:
+    """Decode a frame eagerly."""
+    return LMKWSNotification.from_dict(frame).data
+
+
+def _lazy(frame: dict[str, Any]) -> LMKNotification:
+    """Decode a frame lazily."""
+    return LMKLazyNotification(frame["data"])
+
+
+def _filter(decode: Callable[[dict[str, Any]], LMKNotification]) -> bool:
+    """Decode a frame and filter on its type, as a filtering listener would."""
+    return decode(FRAME).type == "alert"
+
+
+def _allocated(decode: Callable[[dict[str, Any]], LMKNotification]) -> float:
+    """Get the bytes allocated per decoded notification."""
+    tracemalloc.start()
+    notifications = [decode(FRAME) for _ in range(1000)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del notifications
+    return size / 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    for name, decode in (("eager", _eager), ("lazy", _lazy)):
+        elapsed = timeit.timeit(partial(_filter, decode), number=NUMBER)
+        print(
+            f"{name:<6} decode+filter {elapsed / NUMBER * 1e6:5.2f}us"
+            f"  allocated {_allocated(decode):4.0f}B/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
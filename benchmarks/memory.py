@@ -0,0 +1,122 @@
+"""Benchmark the memory held by idle registered connections.
+
+The stand-in server runs in a child process, so only the memory allocated by
+the clients is counted.
+
+Run with `python -m benchmarks.memory [connections]`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+import contextlib
+import multiprocessing
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from letmeknowclient import LMKClient, LMKClientType, generate_user_id
+from letmeknowclient.server import LMKTestServer
+from letmeknowclient.session import SESSION_MANAGER
+from letmeknowclient.utils import connect_client
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+CONNECTIONS = 1000
+BATCH = 100  # Connections opened at a time
+
+
+async def _serve(ports: Queue[int]) -> None:
+    """Run the server until the process is stopped."""
+    async with LMKTestServer() as server:
+        ports.put(server.port)
+        await asyncio.Event().wait()
+
+
+def _run_server(ports: Queue[int]) -> None:
+    """Run the server in the child process."""
+    asyncio.run(_serve(ports))
+
+
+def _listener(port: int) -> LMKClient:
+    """Create an idle listener, using the shared session."""
+    return LMKClient(
+        "127.0.0.1",
+        port,
+        LMKClientType.HEADLESS,
+        generate_user_id(LMKClientType.HEADLESS),
+    )
+
+
+async def _measure(port: int, connections: int) -> None:
+    """Measure the memory allocated per idle registered connection."""
+    # Clients connect without a session of their own, as in a real fleet, so
+    # they share the managed session. Holding it keeps it open across the warm
+    # up and the measurement.
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(SESSION_MANAGER.session())
+
+        # Warm up imports and caches outside of the measurement
+        async with _listener(port) as client:
+            await connect_client(client)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+
+        clients = [_listener(port) for _ in range(connections)]
+        for start in range(0, connections, BATCH):
+            await asyncio.gather(
+                *(connect_client(client) for client in clients[start : start + BATCH])
+            )
+        await asyncio.sleep(0.1)
+
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        # Closed on exit, after the stack was left out of the measurement
+        for client in clients:
+            await stack.enter_async_context(client)
+
+        by_package: defaultdict[str, int] = defaultdict(int)
+        for stat in after.compare_to(before, "filename"):
+            filename = stat.traceback[0].filename
+            package = next(
+                (
+                    name
+                    for name in ("letmeknowclient", "aiohttp", "asyncio", "yarl")
+                    if f"/{name}/" in filename
+                ),
+                "other",
+            )
+            by_package[package] += stat.size_diff
+
+        total = sum(by_package.values())
+        print(
+            f"{len(clients)} connections: {total / len(clients):,.0f} bytes"
+            " per idle registered connection"
+        )
+        for package, size in sorted(by_package.items(), key=lambda item: -item[1]):
+            print(f"  {package:<16} {size / len(clients):>8,.0f} bytes")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else CONNECTIONS
+    if connections < 1:
+        sys.exit("Measure at least 1 connection")
+
+    context = multiprocessing.get_context("spawn")
+    ports: Queue[int] = context.Queue()
+    server = context.Process(target=_run_server, args=(ports,), daemon=True)
+    server.start()
+    try:
+        asyncio.run(_measure(ports.get(timeout=10), connections))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
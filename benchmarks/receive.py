@@ -0,0 +1,71 @@
+"""Benchmark decoding received frames from bytes and from str.
+
+Run with `python -m benchmarks.receive`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+import timeit
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from letmeknowclient import get_json_codec
+
+if TYPE_CHECKING:
+    from letmeknowclient import LMKJSONCodec
+
+NUMBER = 100_000
+
+PAYLOADS = {
+    "small": b'{"type": "notification", "data": {"title": "Ping"}, "targets": []}',
+    "large": (
+        b'{"type": "notification", "data": {"type": "status", "title": "Heartbeat",'
+        b' "subtitle": "nas-01", "content": "'
+        + "All services running \N{CHECK MARK} ".encode()
+        * 50
+        + b'", "image": {"url": "https://example.com/ok.png"}, "timeout": 5000},'
+        b' "targets": ["headless-*"]}'
+    ),
+}
+
+
+def _via_str(codec: LMKJSONCodec, payload: bytes) -> Any:
+    """Decode the payload to str first, as for a decoded text frame."""
+    return codec.loads(payload.decode("utf-8"))
+
+
+def _via_bytes(codec: LMKJSONCodec, payload: bytes) -> Any:
+    """Decode the payload bytes directly."""
+    return codec.loads(payload)
+
+
+def _peak(func: partial[Any]) -> int:
+    """Get the peak bytes allocated by one call."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Run the benchmark."""
+    codec = get_json_codec()
+    print(f"codec: {codec.name} (decodes bytes: {codec.decodes_bytes})")
+
+    for name, payload in PAYLOADS.items():
+        via_str = partial(_via_str, codec, payload)
+        via_bytes = partial(_via_bytes, codec, payload)
+        str_time = timeit.timeit(via_str, number=NUMBER)
+        bytes_time = timeit.timeit(via_bytes, number=NUMBER)
+
+        print(
+            f"{name:<6} {len(payload):5d}B"
+            f"  str {str_time / NUMBER * 1e6:5.2f}us peak {_peak(via_str):6d}B"
+            f"  bytes {bytes_time / NUMBER * 1e6:5.2f}us peak {_peak(via_bytes):6d}B"
+        )
+
+
+if __name__ == "__main__":
+    main()
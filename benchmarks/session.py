@@ -0,0 +1,84 @@
+"""Benchmark connecting clients with their own sessions and a shared session.
+
+Run with `python -m benchmarks.session`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import statistics
+import time
+
+from aiohttp import ClientSession
+
+from letmeknowclient import LMKClient, LMKClientType, generate_user_id
+from letmeknowclient.server import LMKTestServer
+
+CLIENTS = 200
+
+
+async def _connect(port: int, session: ClientSession | None) -> LMKClient:
+    """Connect and register a client."""
+    client = LMKClient(
+        "localhost",
+        port,
+        LMKClientType.HEADLESS,
+        generate_user_id(LMKClientType.HEADLESS),
+        session=session,
+    )
+    await client.ws_connect()
+    await client.ws_register()
+    return client
+
+
+async def _own_sessions(port: int) -> list[float]:
+    """Connect clients that each create their own session."""
+    timings = []
+    clients = []
+    sessions = []
+    for _ in range(CLIENTS):
+        start = time.perf_counter()
+        sessions.append(session := ClientSession())
+        clients.append(await _connect(port, session))
+        timings.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client.ws_close() for client in clients))
+    await asyncio.gather(*(session.close() for session in sessions))
+    return timings
+
+
+async def _shared_session(port: int) -> list[float]:
+    """Connect clients that share the managed session."""
+    timings = []
+    # Closing the clients releases the session, closed with the last one
+    async with contextlib.AsyncExitStack() as stack:
+        for _ in range(CLIENTS):
+            start = time.perf_counter()
+            await stack.enter_async_context(await _connect(port, None))
+            timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    async with LMKTestServer(host="localhost") as server:
+        # Warm up imports outside of the measurement
+        async with await _connect(server.port, None):
+            pass
+
+        for name, run in (
+            ("own sessions", _own_sessions),
+            ("shared session", _shared_session),
+        ):
+            timings = await run(server.port)
+            print(
+                f"{name:<15} connect mean {statistics.fmean(timings) * 1e3:6.2f}ms"
+                f"  p50 {statistics.median(timings) * 1e3:6.2f}ms"
+                f"  max {max(timings) * 1e3:6.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,251 @@
+"""Microbenchmark suite for models serialisation and deserialisation.
+
+Run with `python -m benchmarks.suite --output results.json` and compare a later
+run against it with `python -m benchmarks.suite --baseline results.json`.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from functools import partial
+import json
+from pathlib import Path
+import platform
+import sys
+import timeit
+from typing import TYPE_CHECKING, Any
+
+from letmeknowclient import (
+    VERSION,
+    LMKClientStats,
+    LMKLazyNotification,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSBatchResult,
+    LMKWSNotification,
+    LMKWSRegister,
+    LMKWSRequestType,
+    LMKWSResponseError,
+    LMKWSResponseSuccess,
+    LMKWSResponseType,
+    get_json_codec,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from letmeknowclient import LMKJSONCodec
+
+REPEAT = 5
+
+
+@dataclass(slots=True)
+class Args:
+    """Arguments for the benchmark suite."""
+
+    output: Path | None = None
+    baseline: Path | None = None
+    threshold: float = 0.1
+    filter: str | None = None
+
+
+def interpret_args() -> Args:
+    """Interpret the arguments from the command line.
+
+    Returns
+    -------
+        Args: The arguments.
+
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for LetMeKnow models")
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare against this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown ratio reported as a regression",
+    )
+    parser.add_argument("--filter", help="Only run benchmarks containing this")
+    args = parser.parse_args()
+
+    return Args(
+        output=args.output,
+        baseline=args.baseline,
+        threshold=args.threshold,
+        filter=args.filter,
+    )
+
+
+def _notification(size: int) -> LMKNotification:
+    """Create a notification with content of about `size` characters."""
+    return LMKNotification(
+        type="status",
+        title="Heartbeat",
+        subtitle="nas-01",
+        content=("All services running \N{CHECK MARK} " * size)[:size],
+        image=LMKNotificationImage(url="https://example.com/ok.png"),
+        timeout=5000,
+    )
+
+
+def _encode(codec: LMKJSONCodec, frame: LMKWSNotification) -> str:
+    """Encode a frame through to_dict and the codec."""
+    return codec.dumps(frame.to_dict())
+
+
+def _decode(codec: LMKJSONCodec, text: str) -> LMKWSNotification:
+    """Decode a frame through the codec and from_dict."""
+    return LMKWSNotification.from_dict(codec.loads(text))
+
+
+def _decode_trusted(codec: LMKJSONCodec, text: str) -> LMKWSNotification:
+    """Decode a frame through the codec and from_dict_trusted."""
+    return LMKWSNotification.from_dict_trusted(codec.loads(text))
+
+
+def _throughput() -> float:
+    """Create a batch result and get its throughput."""
+    return LMKWSBatchResult(responses=[], duration=1.0).throughput
+
+
+def benchmarks() -> dict[str, Callable[[], Any]]:
+    """Get the benchmarks to run, by name."""
+    codec = get_json_codec()
+    cases: dict[str, Callable[[], Any]] = {}
+
+    notification = _notification(32)
+    models: tuple[Any, ...] = (
+        notification,
+        notification.image,
+        LMKWSRegister(type=LMKWSRequestType.REGISTER, user_id="headless-1"),
+        LMKWSNotification(
+            type=LMKWSRequestType.NOTIFICATION,
+            data=notification,
+            targets=["headless-*"],
+        ),
+        LMKWSResponseError(
+            type=LMKWSResponseType.ERROR,
+            message="Invalid target",
+            error="BadRequest",
+        ),
+        LMKWSResponseSuccess(
+            type=LMKWSResponseType.NOTIFICATION_SENT,
+            succeeded=True,
+            message="Sent",
+        ),
+    )
+    for model in models:
+        name = type(model).__name__
+        data = model.to_dict()
+        cases[f"{name}.to_dict"] = model.to_dict
+        cases[f"{name}.from_dict"] = partial(type(model).from_dict, data)
+        cases[f"{name}.from_dict_trusted"] = partial(
+            type(model).from_dict_trusted, data
+        )
+        if hasattr(model, "to_json"):
+            cases[f"{name}.to_json"] = model.to_json
+
+    cases["LMKLazyNotification.from_dict"] = partial(
+        LMKLazyNotification.from_dict, notification.to_dict()
+    )
+    cases["LMKClientStats.init"] = LMKClientStats
+    cases["LMKWSBatchResult.throughput"] = _throughput
+
+    for size in (0, 256, 4096, 65536):
+        frame = LMKWSNotification(
+            type=LMKWSRequestType.NOTIFICATION,
+            data=_notification(size),
+            targets=[f"client-{index}" for index in range(1 + size // 1024)],
+        )
+        text = _encode(codec, frame)
+        cases[f"encode.{size}"] = partial(_encode, codec, frame)
+        cases[f"encode.to_json.{size}"] = frame.to_json
+        cases[f"decode.{size}"] = partial(_decode, codec, text)
+        cases[f"decode.trusted.{size}"] = partial(_decode_trusted, codec, text)
+
+    return cases
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """Measure a benchmark.
+
+    Returns
+    -------
+        The best time per call, in nanoseconds.
+
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number * 1e9
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """Compare results against a baseline.
+
+    Returns
+    -------
+        The names of the benchmarks that regressed.
+
+    """
+    regressions: list[str] = []
+    for name, value in results.items():
+        if (previous := baseline.get(name)) is None:
+            continue
+        ratio = value / previous
+        if ratio > 1 + threshold:
+            regressions.append(name)
+        marker = " REGRESSION" if name in regressions else ""
+        print(f"{name:<44} {previous:10.0f}ns -> {value:10.0f}ns {ratio:5.2f}x{marker}")
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmark suite.
+
+    Returns
+    -------
+        The exit code, non-zero if there were regressions.
+
+    """
+    args = interpret_args()
+
+    results: dict[str, float] = {}
+    for name, func in benchmarks().items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(func)
+        if args.baseline is None:
+            print(f"{name:<44} {results[name]:10.0f}ns")
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "version": VERSION,
+                    "python": platform.python_version(),
+                    "codec": get_json_codec().name,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
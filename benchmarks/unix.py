@@ -0,0 +1,95 @@
+"""Benchmark request latency over TCP and over a Unix socket.
+
+Both transports connect to the same stand-in server, which listens on a
+loopback TCP port and on a Unix socket.
+
+Run with `python -m benchmarks.unix`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import statistics
+import tempfile
+import time
+
+from letmeknowclient import (
+    LMKClient,
+    LMKClientType,
+    LMKNotification,
+    LMKWSResponseType,
+    generate_user_id,
+)
+from letmeknowclient.server import LMKTestServer
+
+NUMBER = 5000
+
+NOTIFICATION = LMKNotification(type="status", title="Heartbeat")
+
+
+async def _measure(
+    server: LMKTestServer,
+    socket_path: str | None,
+) -> tuple[list[float], float]:
+    """Time sequential notification round trips to a listener.
+
+    Returns
+    -------
+        The latency of each round trip, and the CPU time used per round trip.
+
+    """
+    listener = LMKClient(
+        server.host,
+        server.port,
+        LMKClientType.HEADLESS,
+        generate_user_id(LMKClientType.HEADLESS),
+        lmk_socket_path=socket_path,
+    )
+    sender = LMKClient(
+        server.host,
+        server.port,
+        LMKClientType.CLIENT,
+        generate_user_id(LMKClientType.CLIENT),
+        lmk_socket_path=socket_path,
+    )
+    async with listener, sender:
+        for client in (listener, sender):
+            await client.connect()
+            if (await client.ws_wait_registered()).type != LMKWSResponseType.REGISTER:
+                msg = "Failed to register"
+                raise AssertionError(msg)
+
+        stream = listener.notifications()
+        timings = []
+        cpu_start = time.process_time()
+        for _ in range(NUMBER):
+            start = time.perf_counter()
+            await sender.ws_send_notification(NOTIFICATION, [listener.lmk_user_id])
+            await anext(stream)
+            timings.append(time.perf_counter() - start)
+        cpu = (time.process_time() - cpu_start) / NUMBER
+
+    return timings, cpu
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "lmk.sock")
+
+        async with LMKTestServer(path=path) as server:
+            for name, socket_path in (("tcp", None), ("unix", path)):
+                timings, cpu = await _measure(server, socket_path)
+                timings.sort()
+                mean = statistics.fmean(timings)
+                print(
+                    f"{name:<5} round trip mean {mean * 1e6:6.1f}us"
+                    f"  p50 {timings[len(timings) // 2] * 1e6:6.1f}us"
+                    f"  p99 {timings[int(len(timings) * 0.99)] * 1e6:6.1f}us"
+                    f"  cpu {cpu * 1e6:6.1f}us"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
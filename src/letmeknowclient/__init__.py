@@ -1,12 +1,17 @@
 """Client for LetMeKnow."""
 
+from .codec import LMKJSONCodec, get_json_codec
 from .const import TARGETS_ALL, TARGETS_ALL_CLIENTS, TARGETS_ALL_HEADLESS, VERSION
+from .dispatch import LMKCallbackDispatcher, LMKNotificationDispatcher
 from .exceptions import LMKConnectionError, LMKError, LMKNotConnectedError
-from .lmk import LMKClient
+from .lmk import LMKClient, LMKClientConfig
 from .models import (
+    LMKClientStats,
     LMKClientType,
+    LMKLazyNotification,
     LMKNotification,
     LMKNotificationImage,
+    LMKWSBatchResult,
     LMKWSNotification,
     LMKWSRegister,
     LMKWSRequestType,
@@ -14,6 +19,9 @@ from .models import (
     LMKWSResponseSuccess,
     LMKWSResponseType,
 )
+from .pool import LMKClientPool
+from .session import LMKSessionManager
+from .stream import LMKNotificationStream, LMKOverflowPolicy
 from .utils import generate_user_id
 
 __all__ = [
@@ -21,13 +29,24 @@ __all__ = [
     "TARGETS_ALL_CLIENTS",
     "TARGETS_ALL_HEADLESS",
     "VERSION",
+    "LMKCallbackDispatcher",
     "LMKClient",
+    "LMKClientConfig",
+    "LMKClientPool",
     "LMKConnectionError",
+    "LMKJSONCodec",
     "LMKError",
     "LMKNotConnectedError",
+    "LMKClientStats",
     "LMKClientType",
+    "LMKLazyNotification",
     "LMKNotification",
+    "LMKNotificationDispatcher",
     "LMKNotificationImage",
+    "LMKNotificationStream",
+    "LMKOverflowPolicy",
+    "LMKSessionManager",
+    "LMKWSBatchResult",
     "LMKWSNotification",
     "LMKWSRegister",
     "LMKWSRequestType",
@@ -35,4 +54,5 @@ __all__ = [
     "LMKWSResponseSuccess",
     "LMKWSResponseType",
     "generate_user_id",
+    "get_json_codec",
 ]
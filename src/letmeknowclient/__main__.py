@@ -0,0 +1,244 @@
+"""Command line interface for LetMeKnow."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import sys
+from typing import TYPE_CHECKING
+
+from .bench import LMKBenchConfig, LMKBenchResult, run_bench
+from .exceptions import LMKError
+from .fleet import LMKFleetConfig, LMKFleetResult, run_fleet
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+def interpret_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Interpret the arguments from the command line.
+
+    Returns
+    -------
+        The arguments.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m letmeknowclient",
+        description="LetMeKnow client tools",
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench_parser = commands.add_parser("bench", help="Run a load test against a server")
+    bench_parser.add_argument("--host", default="localhost", help="Host of the server")
+    bench_parser.add_argument(
+        "--port", type=int, default=8080, help="Port of the server"
+    )
+    bench_parser.add_argument(
+        "--socket-path", help="Unix socket of the server, to connect over instead"
+    )
+    bench_parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Run against a stand-in server in this process",
+    )
+    bench_parser.add_argument(
+        "--senders", type=int, default=1, help="Sender connections"
+    )
+    bench_parser.add_argument(
+        "--listeners", type=int, default=1, help="Listener connections"
+    )
+    bench_parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Notifications per second over all senders, 0 for max rate",
+    )
+    bench_parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds to send for"
+    )
+    bench_parser.add_argument(
+        "--window", type=int, default=64, help="Sends in flight per sender"
+    )
+
+    fleet_parser = commands.add_parser(
+        "fleet", help="Simulate many listeners and broadcast to them"
+    )
+    fleet_parser.add_argument("--host", default="localhost", help="Host of the server")
+    fleet_parser.add_argument(
+        "--port", type=int, default=8080, help="Port of the server"
+    )
+    fleet_parser.add_argument(
+        "--socket-path", help="Unix socket of the server, to connect over instead"
+    )
+    fleet_parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Run against a stand-in server in this process, whose memory is "
+        "then counted with the fleet's",
+    )
+    fleet_parser.add_argument("--clients", type=int, default=1000, help="Listeners")
+    fleet_parser.add_argument(
+        "--ramp-concurrency",
+        type=int,
+        default=100,
+        help="Listeners connecting at a time",
+    )
+    fleet_parser.add_argument("--broadcasts", type=int, default=3, help="Broadcasts")
+    fleet_parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between broadcasts"
+    )
+    fleet_parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Seconds to wait per broadcast"
+    )
+    fleet_parser.add_argument(
+        "--no-trace-memory",
+        dest="trace_memory",
+        action="store_false",
+        help="Do not trace memory allocations, which slows down the ramp up",
+    )
+
+    return parser.parse_args(argv)
+
+
+@contextlib.asynccontextmanager
+async def _server(
+    config: LMKBenchConfig | LMKFleetConfig,
+    local: bool,  # noqa: FBT001
+) -> AsyncIterator[None]:
+    """Run a stand-in server for the load test, if requested."""
+    if not local:
+        yield
+        return
+
+    # Only import the server, and aiohttp.web, when it is used
+    from .server import LMKTestServer  # pylint: disable=import-outside-toplevel
+
+    async with LMKTestServer(path=config.socket_path) as server:
+        config.host = server.host
+        config.port = server.port
+        yield
+
+
+def print_bench_result(config: LMKBenchConfig, result: LMKBenchResult) -> None:
+    """Print the result of a load test."""
+    print(  # noqa: T201
+        f"target      {config.socket_path or f'{config.host}:{config.port}'}\n"
+        f"connections {config.senders} senders, {config.listeners} listeners\n"
+        f"rate        {f'{config.rate:,.0f}/s' if config.rate else 'max'}"
+        f" for {result.duration:.1f}s\n"
+        f"sent        {result.sent:,} ({result.throughput:,.0f}/s)\n"
+        f"delivered   {result.delivered:,}"
+        f" of {result.sent * config.listeners:,}\n"
+        f"errors      {result.errors:,}\n"
+        f"reconnects  {result.reconnects:,}\n"
+        f"latency     p50 {result.percentile(50) * 1e3:.2f}ms"
+        f"  p90 {result.percentile(90) * 1e3:.2f}ms"
+        f"  p99 {result.percentile(99) * 1e3:.2f}ms"
+        f"  max {result.percentile(100) * 1e3:.2f}ms"
+    )
+
+
+async def bench(args: argparse.Namespace) -> None:
+    """Run the load test command."""
+    config = LMKBenchConfig(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket_path,
+        senders=args.senders,
+        listeners=args.listeners,
+        rate=args.rate,
+        duration=args.duration,
+        window=args.window,
+    )
+
+    async with _server(config, args.local):
+        result = await run_bench(config)
+
+    print_bench_result(config, result)
+
+
+def print_fleet_result(config: LMKFleetConfig, result: LMKFleetResult) -> None:
+    """Print the result of a fleet simulation."""
+    lines = [
+        f"target      {config.socket_path or f'{config.host}:{config.port}'}",
+        f"connected   {result.connected:,} of {config.clients:,}"
+        f" in {result.ramp_duration:.2f}s ({result.connection_rate:,.0f}/s)",
+        f"failed      {result.failed:,}",
+        f"dropped     {result.disconnected:,}",
+    ]
+    if (memory := result.memory_per_connection) is not None:
+        lines.append(
+            f"memory      {memory / 1024:,.1f}KiB per connection"
+            f" ({(result.memory or 0) / 1024**2:,.1f}MiB total)"
+        )
+    for index, broadcast in enumerate(result.broadcasts):
+        completion = (
+            f"{broadcast.completion * 1e3:.1f}ms"
+            if broadcast.completion is not None
+            else "incomplete"
+        )
+        lines.append(
+            f"broadcast {index} {broadcast.delivered:,} of {broadcast.expected:,}"
+            f"  fan-out {completion}"
+            f"  p50 {broadcast.percentile(50) * 1e3:.1f}ms"
+            f"  p99 {broadcast.percentile(99) * 1e3:.1f}ms"
+        )
+    print("\n".join(lines))  # noqa: T201
+
+
+async def fleet(args: argparse.Namespace) -> None:
+    """Run the fleet simulator command."""
+    config = LMKFleetConfig(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket_path,
+        clients=args.clients,
+        ramp_concurrency=args.ramp_concurrency,
+        broadcasts=args.broadcasts,
+        broadcast_interval=args.interval,
+        broadcast_timeout=args.timeout,
+        trace_memory=args.trace_memory,
+    )
+
+    async with _server(config, args.local):
+        result = await run_fleet(config)
+
+    print_fleet_result(config, result)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface.
+
+    Returns
+    -------
+        The exit code.
+
+    """
+    args = interpret_args(argv)
+
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+        level=logging.DEBUG if args.debug else logging.WARNING,
+    )
+
+    try:
+        if args.command == "bench":
+            asyncio.run(bench(args))
+        elif args.command == "fleet":
+            asyncio.run(fleet(args))
+    except (LMKError, TimeoutError) as error:
+        message = str(error) or type(error).__name__
+        if error.__cause__ is not None:
+            message = f"{message}: {error.__cause__}"
+        print(f"Error: {message}", file=sys.stderr)  # noqa: T201
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
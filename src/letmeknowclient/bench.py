@@ -0,0 +1,265 @@
+"""Load generator for LetMeKnow servers."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING
+
+from . import utils
+from .const import LOGGER
+from .exceptions import LMKError
+from .lmk import LMKClient
+from .models import LMKClientType, LMKNotification, LMKWSResponseType
+from .session import SESSION_MANAGER
+from .utils import connect_client, generate_user_id
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from aiohttp import ClientSession
+
+BENCH_NOTIFICATION_TYPE = "lmk-bench"
+
+
+@dataclass(slots=True)
+class LMKBenchConfig:
+    """Load generator configuration."""
+
+    host: str = "localhost"
+    port: int = 8080
+    socket_path: str | None = None  # Unix socket to connect over instead
+    senders: int = 1
+    listeners: int = 1
+    rate: float = 0.0  # Notifications per second over all senders, 0 for max
+    duration: float = 10.0
+    window: int = 64
+    drain_timeout: float = 5.0
+
+
+@dataclass(slots=True)
+class LMKBenchResult:
+    """Load generator result."""
+
+    duration: float = 0.0
+    sent: int = 0
+    errors: int = 0
+    delivered: int = 0
+    reconnects: int = 0
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Notifications sent per second."""
+        if self.duration <= 0:
+            return 0.0
+        return self.sent / self.duration
+
+    def percentile(self, percentile: float) -> float:
+        """Get a send to receive latency percentile, in seconds.
+
+        Args:
+        ----
+            percentile: Percentile to get, from 0 to 100.
+
+        """
+        return utils.percentile(self.latencies, percentile)
+
+
+async def _connect(
+    session: ClientSession,
+    config: LMKBenchConfig,
+    client_type: LMKClientType,
+) -> LMKClient:
+    """Connect and register a client.
+
+    Returns
+    -------
+        The registered client.
+
+    """
+    return await connect_client(
+        LMKClient(
+            lmk_host=config.host,
+            lmk_port=config.port,
+            lmk_client_type=client_type,
+            lmk_user_id=generate_user_id(client_type),
+            session=session,
+            lmk_socket_path=config.socket_path,
+        )
+    )
+
+
+async def _send(
+    client: LMKClient,
+    targets: list[str],
+    result: LMKBenchResult,
+) -> None:
+    """Send one timestamped notification.
+
+    Args:
+    ----
+        client: Client to send with.
+        targets: Listeners to send to.
+        result: Result to count the send in.
+
+    """
+    notification = LMKNotification(
+        type=BENCH_NOTIFICATION_TYPE,
+        title=client.lmk_user_id,
+        content=str(time.perf_counter()),
+    )
+    try:
+        response = await client.ws_send_notification(notification, targets)
+    except (LMKError, TimeoutError) as error:
+        LOGGER.debug("Send failed: %s", error)
+        result.errors += 1
+        return
+
+    if response.type == LMKWSResponseType.NOTIFICATION_SENT:
+        result.sent += 1
+    else:
+        result.errors += 1
+
+
+async def _run_sender(
+    client: LMKClient,
+    config: LMKBenchConfig,
+    targets: list[str],
+    result: LMKBenchResult,
+    deadline: float,
+) -> None:
+    """Send notifications until the deadline.
+
+    Args:
+    ----
+        client: Client to send with.
+        config: Load generator configuration.
+        targets: Listeners to send to.
+        result: Result to count the sends in.
+        deadline: Loop time to stop sending at.
+
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(config.window)
+    tasks: set[asyncio.Task[None]] = set()
+    interval = config.senders / config.rate if config.rate > 0 else 0.0
+    next_send = loop.time()
+
+    def _done(task: asyncio.Task[None]) -> None:
+        tasks.discard(task)
+        semaphore.release()
+
+    while loop.time() < deadline:
+        if interval:
+            next_send += interval
+            if (delay := next_send - loop.time()) > 0:
+                await asyncio.sleep(delay)
+
+        await semaphore.acquire()
+        if not client.ws_connected:
+            # Wait for the keep alive task to reconnect
+            semaphore.release()
+            await asyncio.sleep(0.1)
+            continue
+
+        task = asyncio.create_task(_send(client, targets, result))
+        tasks.add(task)
+        task.add_done_callback(_done)
+
+    await asyncio.gather(*tasks)
+
+
+async def _listen(
+    client: LMKClient,
+    cb: Callable[[LMKNotification], None],
+) -> None:
+    """Listen for notifications across reconnects.
+
+    Args:
+    ----
+        client: Client to listen with.
+        cb: Callback to call when a notification is received.
+
+    """
+    while True:
+        if client.ws_connected:
+            await client.ws_listen_for_notifications(cb)
+        else:
+            await asyncio.sleep(0.1)
+
+
+async def run_bench(config: LMKBenchConfig) -> LMKBenchResult:
+    """Run the load generator against a LetMeKnow server.
+
+    Senders send timestamped notifications to the listeners, at the configured
+    rate or as fast as the window allows, and listeners record the send to
+    receive latency of each delivery.
+
+    Args:
+    ----
+        config: Load generator configuration.
+
+    Returns:
+    -------
+        The load generator result.
+
+    """
+    loop = asyncio.get_running_loop()
+    result = LMKBenchResult()
+
+    def _received(notification: LMKNotification) -> None:
+        if notification.type != BENCH_NOTIFICATION_TYPE:
+            return
+        result.delivered += 1
+        result.latencies.append(time.perf_counter() - float(notification.content or 0))
+
+    async with SESSION_MANAGER.session(config.socket_path) as session:
+        listeners = await asyncio.gather(
+            *(
+                _connect(session, config, LMKClientType.HEADLESS)
+                for _ in range(config.listeners)
+            )
+        )
+        senders = await asyncio.gather(
+            *(
+                _connect(session, config, LMKClientType.CLIENT)
+                for _ in range(config.senders)
+            )
+        )
+        clients = [*listeners, *senders]
+        targets = [listener.lmk_user_id for listener in listeners]
+
+        keep_alive_tasks = [
+            asyncio.create_task(client.ws_keep_alive()) for client in clients
+        ]
+        listen_tasks = [
+            asyncio.create_task(_listen(listener, _received)) for listener in listeners
+        ]
+
+        start = loop.time()
+        await asyncio.gather(
+            *(
+                _run_sender(sender, config, targets, result, start + config.duration)
+                for sender in senders
+            )
+        )
+        result.duration = loop.time() - start
+
+        # Give the last deliveries time to arrive
+        expected = result.sent * len(listeners)
+        drain_deadline = loop.time() + config.drain_timeout
+        while result.delivered < expected and loop.time() < drain_deadline:
+            await asyncio.sleep(0.05)
+
+        for task in keep_alive_tasks:
+            task.cancel()
+        await asyncio.gather(*(client.ws_close() for client in clients))
+        for task in listen_tasks:
+            task.cancel()
+        await asyncio.gather(*keep_alive_tasks, *listen_tasks, return_exceptions=True)
+
+        result.reconnects = sum(client.stats.reconnects for client in clients)
+
+    return result
@@ -0,0 +1,100 @@
+"""JSON codecs for LetMeKnow."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from importlib.util import find_spec
+import json
+from typing import TYPE_CHECKING, Any, Final
+
+from .exceptions import LMKError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CODEC_JSON: Final[str] = "json"
+CODEC_MSGSPEC: Final[str] = "msgspec"
+CODEC_ORJSON: Final[str] = "orjson"
+
+# Fastest first, stdlib json is always available
+CODECS: Final[tuple[str, ...]] = (CODEC_ORJSON, CODEC_MSGSPEC, CODEC_JSON)
+
+
+@dataclass(frozen=True, slots=True)
+class LMKJSONCodec:
+    """JSON codec used to encode and decode websocket frames."""
+
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[str | bytes], Any]
+    decode_errors: tuple[type[Exception], ...] = (ValueError,)
+    # Decodes UTF-8 bytes without first converting them to a str
+    decodes_bytes: bool = False
+
+
+def _load_codec(name: str) -> LMKJSONCodec:
+    """Load a codec, raising ImportError if its library is not installed."""
+    # The optional libraries are only covered where they are installed
+    if name == CODEC_ORJSON:  # pragma: no cover
+        import orjson  # pylint: disable=import-error,import-outside-toplevel
+
+        orjson_dumps = orjson.dumps
+
+        return LMKJSONCodec(
+            name=name,
+            dumps=lambda obj: orjson_dumps(obj).decode(),
+            loads=orjson.loads,
+            decodes_bytes=True,
+        )
+
+    if name == CODEC_MSGSPEC:  # pragma: no cover
+        import msgspec  # pylint: disable=import-error,import-outside-toplevel
+
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+
+        return LMKJSONCodec(
+            name=name,
+            dumps=lambda obj: encoder.encode(obj).decode(),
+            loads=decoder.decode,
+            decode_errors=(msgspec.DecodeError,),
+            decodes_bytes=True,
+        )
+
+    return LMKJSONCodec(
+        name=CODEC_JSON,
+        dumps=json.dumps,
+        loads=json.loads,
+    )
+
+
+@cache
+def get_json_codec(name: str | None = None) -> LMKJSONCodec:
+    """Get a JSON codec.
+
+    Args:
+    ----
+        name: Codec to use. Defaults to the fastest one installed.
+
+    Returns:
+    -------
+        The JSON codec.
+
+    """
+    if name is None:
+        name = next(
+            codec_name
+            for codec_name in CODECS
+            if codec_name == CODEC_JSON or find_spec(codec_name) is not None
+        )
+
+    if name not in CODECS:
+        msg = f"Unknown JSON codec: {name}"
+        raise LMKError(msg)
+
+    try:
+        return _load_codec(name)
+    except ImportError as error:
+        msg = f"JSON codec {name} is not installed"
+        raise LMKError(msg) from error
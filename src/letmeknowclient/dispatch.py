@@ -0,0 +1,321 @@
+"""Notification callback dispatch for LetMeKnow."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import TYPE_CHECKING, Final
+
+from .const import LOGGER
+from .stream import LMKNotificationStream
+
+WILDCARD: Final[str] = "*"
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from concurrent.futures import Executor
+
+    from .models import LMKNotification
+
+
+class LMKCallbackDispatcher:
+    """Run a notification callback off the websocket reader.
+
+    Coroutine callbacks run as tasks and blocking callbacks run in an
+    executor, with at most `max_concurrency` in flight. When the limit is
+    reached the reader waits for a slot, so a slow consumer applies
+    backpressure instead of growing an unbounded backlog. With `ordered`,
+    callbacks run one at a time in the order notifications were received.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        cb: Callable[[LMKNotification], Awaitable[None] | None],
+        *,
+        max_concurrency: int = 16,
+        ordered: bool = False,
+        blocking: bool = False,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+        ----
+            cb: Callback to call when a notification is received.
+            max_concurrency: Maximum number of callbacks in flight.
+            ordered: Run callbacks one at a time, in order.
+            blocking: Run a synchronous callback in the executor.
+            executor: Executor for blocking callbacks. Defaults to the loop's.
+
+        """
+        self.cb = cb
+        self.max_concurrency = max_concurrency
+        self.blocking = blocking
+        self.executor = executor
+        self._is_coroutine = inspect.iscoroutinefunction(cb)
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._stream: LMKNotificationStream | None = None
+        self._worker: asyncio.Task[None] | None = None
+
+        if ordered:
+            self._stream = LMKNotificationStream(maxsize=max_concurrency)
+
+    def __call__(self, notification: LMKNotification) -> Awaitable[None] | None:
+        """Dispatch a notification to the callback.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        Returns:
+        -------
+            An awaitable to wait on when the concurrency limit is reached.
+
+        """
+        if self._stream is not None:
+            if self._worker is None:
+                self._worker = asyncio.create_task(self._run_ordered(self._stream))
+            return self._stream.put(notification)
+
+        if len(self._tasks) >= self.max_concurrency:
+            return self._spawn_when_free(notification)
+
+        self._spawn(notification)
+        return None
+
+    async def close(self, *, cancel: bool = False) -> None:
+        """Wait for, or cancel, the callbacks in flight.
+
+        Args:
+        ----
+            cancel: Cancel the callbacks instead of waiting for them.
+
+        """
+        if self._stream is not None:
+            self._stream.close()
+
+        tasks = set(self._tasks)
+        if self._worker is not None:
+            tasks.add(self._worker)
+
+        if cancel:
+            for task in tasks:
+                task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _call(self, notification: LMKNotification) -> None:
+        """Run the callback for a notification.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        """
+        try:
+            if self._is_coroutine:
+                await self.cb(notification)  # type: ignore[misc]
+            elif self.blocking:
+                await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.cb, notification
+                )
+            elif (result := self.cb(notification)) is not None:
+                await result
+        except Exception:  # noqa: BLE001 # pylint: disable=broad-except
+            LOGGER.exception("Error in notification listener")
+
+    def _spawn(self, notification: LMKNotification) -> None:
+        """Run the callback for a notification in a new task.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        """
+        task = asyncio.create_task(self._call(notification))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spawn_when_free(self, notification: LMKNotification) -> None:
+        """Run the callback once a callback in flight has finished.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        """
+        while len(self._tasks) >= self.max_concurrency:
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+        self._spawn(notification)
+
+    async def _run_ordered(self, stream: LMKNotificationStream) -> None:
+        """Run the callback for each notification in order.
+
+        Args:
+        ----
+            stream: Stream of notifications to handle.
+
+        """
+        async for notification in stream:
+            await self._call(notification)
+
+
+class LMKNotificationDispatcher:
+    """Route received notifications to handlers subscribed by type.
+
+    Handlers are indexed by notification type, so dispatching costs the same
+    however many handlers are subscribed to other types. Handlers subscribed
+    to the wildcard receive every notification. The index is copied on write,
+    so handlers can subscribe and unsubscribe while notifications are being
+    dispatched.
+
+    Synchronous handlers run inline. Coroutine handlers run as tasks through
+    an LMKCallbackDispatcher each, so they do not stall reading the socket
+    until `max_concurrency` of them are in flight.
+
+    Pass the dispatcher as the callback to ws_listen_for_notifications.
+    """
+
+    def __init__(self, *, max_concurrency: int = 16) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+        ----
+            max_concurrency: Maximum number of calls in flight per coroutine
+                handler.
+
+        """
+        self.max_concurrency = max_concurrency
+        self._handlers: dict[
+            str | None,
+            tuple[Callable[[LMKNotification], Awaitable[None] | None], ...],
+        ] = {}
+        self._dispatchers: dict[
+            tuple[
+                str | None,
+                Callable[[LMKNotification], Awaitable[None] | None],
+            ],
+            LMKCallbackDispatcher,
+        ] = {}
+
+    def __call__(self, notification: LMKNotification) -> Awaitable[None] | None:
+        """Dispatch a notification to the handlers subscribed to its type.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        Returns:
+        -------
+            An awaitable to wait on when a coroutine handler is at its
+            concurrency limit.
+
+        """
+        handlers = self._handlers.get(notification.type, ())
+        if notification.type != WILDCARD and (wildcard := self._handlers.get(WILDCARD)):
+            handlers += wildcard
+
+        awaitables: list[Awaitable[None]] = []
+        for handler in handlers:
+            try:
+                if (result := handler(notification)) is not None:
+                    awaitables.append(result)
+            except Exception:  # noqa: BLE001, PERF203 # pylint: disable=broad-except
+                LOGGER.exception("Error in notification handler")
+
+        if awaitables:
+            return self._gather(awaitables)
+        return None
+
+    def subscribe(
+        self,
+        handler: Callable[[LMKNotification], Awaitable[None] | None],
+        notification_type: str | None = WILDCARD,
+    ) -> Callable[[], None]:
+        """Subscribe a handler to notifications of a type.
+
+        Args:
+        ----
+            handler: Handler to call when a notification is received.
+            notification_type: Type of notification to handle. Defaults to all.
+
+        Returns:
+        -------
+            A function that unsubscribes the handler.
+
+        """
+        callback = handler
+        if inspect.iscoroutinefunction(handler):
+            key = (notification_type, handler)
+            if (dispatcher := self._dispatchers.get(key)) is None:
+                dispatcher = self._dispatchers[key] = LMKCallbackDispatcher(
+                    handler, max_concurrency=self.max_concurrency
+                )
+            callback = dispatcher
+
+        self._handlers[notification_type] = (
+            *self._handlers.get(notification_type, ()),
+            callback,
+        )
+
+        def _unsubscribe() -> None:
+            self.unsubscribe(handler, notification_type)
+
+        return _unsubscribe
+
+    def unsubscribe(
+        self,
+        handler: Callable[[LMKNotification], Awaitable[None] | None],
+        notification_type: str | None = WILDCARD,
+    ) -> None:
+        """Unsubscribe a handler from notifications of a type.
+
+        Args:
+        ----
+            handler: Handler to remove.
+            notification_type: Type of notification the handler was subscribed to.
+
+        """
+        callback = self._dispatchers.get((notification_type, handler), handler)
+        handlers = list(self._handlers.get(notification_type, ()))
+        if callback not in handlers:
+            return
+
+        handlers.remove(callback)
+        if handlers:
+            self._handlers[notification_type] = tuple(handlers)
+        else:
+            del self._handlers[notification_type]
+
+        # Calls in flight finish on their own
+        if isinstance(callback, LMKCallbackDispatcher) and callback not in handlers:
+            del self._dispatchers[(notification_type, handler)]
+
+    async def close(self, *, cancel: bool = False) -> None:
+        """Wait for, or cancel, the coroutine handlers in flight.
+
+        Args:
+        ----
+            cancel: Cancel the handlers instead of waiting for them.
+
+        """
+        await asyncio.gather(
+            *(
+                dispatcher.close(cancel=cancel)
+                for dispatcher in self._dispatchers.values()
+            )
+        )
+
+    @staticmethod
+    async def _gather(awaitables: list[Awaitable[None]]) -> None:
+        """Wait for the handlers that returned an awaitable.
+
+        Args:
+        ----
+            awaitables: Results of the handlers.
+
+        """
+        for result in await asyncio.gather(*awaitables, return_exceptions=True):
+            if isinstance(result, Exception):
+                LOGGER.error("Error in notification handler", exc_info=result)
@@ -0,0 +1,274 @@
+"""Fleet simulator for many LetMeKnow listeners in one process."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from . import utils
+from .const import LOGGER, TARGETS_ALL_HEADLESS
+from .exceptions import LMKError
+from .lmk import LMKClient
+from .models import LMKClientType, LMKNotification
+from .session import SESSION_MANAGER
+from .utils import connect_client, generate_user_id
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+FLEET_NOTIFICATION_TYPE = "lmk-fleet"
+
+
+@dataclass(slots=True)
+class LMKFleetConfig:
+    """Fleet simulator configuration."""
+
+    host: str = "localhost"
+    port: int = 8080
+    socket_path: str | None = None  # Unix socket to connect over instead
+    clients: int = 1000
+    ramp_concurrency: int = 100  # Connections opened at a time
+    broadcasts: int = 3
+    broadcast_interval: float = 1.0
+    broadcast_timeout: float = 30.0
+    trace_memory: bool = True
+
+
+@dataclass(slots=True)
+class LMKFleetBroadcast:
+    """Delivery of one broadcast to the fleet."""
+
+    expected: int
+    delivered: int = 0
+    completion: float | None = None  # Seconds until the last delivery
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    def percentile(self, percentile: float) -> float:
+        """Get a send to receive latency percentile, in seconds.
+
+        Args:
+        ----
+            percentile: Percentile to get, from 0 to 100.
+
+        """
+        return utils.percentile(self.latencies, percentile)
+
+
+@dataclass(slots=True)
+class LMKFleetResult:
+    """Fleet simulator result."""
+
+    connected: int = 0
+    failed: int = 0
+    ramp_duration: float = 0.0
+    memory: int | None = None  # Bytes allocated by the whole fleet
+    disconnected: int = 0
+    broadcasts: list[LMKFleetBroadcast] = field(default_factory=list)
+
+    @property
+    def connection_rate(self) -> float:
+        """Connections registered per second while ramping up."""
+        if self.ramp_duration <= 0:
+            return 0.0
+        return self.connected / self.ramp_duration
+
+    @property
+    def memory_per_connection(self) -> float | None:
+        """Bytes allocated per registered connection."""
+        if self.memory is None or not self.connected:
+            return None
+        return self.memory / self.connected
+
+
+async def _connect(
+    session: ClientSession,
+    config: LMKFleetConfig,
+    client_type: LMKClientType,
+) -> LMKClient:
+    """Connect and register a client.
+
+    Returns
+    -------
+        The registered client.
+
+    """
+    return await connect_client(
+        LMKClient(
+            lmk_host=config.host,
+            lmk_port=config.port,
+            lmk_client_type=client_type,
+            lmk_user_id=generate_user_id(client_type),
+            session=session,
+            lmk_socket_path=config.socket_path,
+        )
+    )
+
+
+async def _ramp_up(
+    session: ClientSession,
+    config: LMKFleetConfig,
+    result: LMKFleetResult,
+) -> list[LMKClient]:
+    """Connect and register the fleet of headless listeners.
+
+    Args:
+    ----
+        session: Session shared by the fleet.
+        config: Fleet simulator configuration.
+        result: Result to count the connections in.
+
+    Returns:
+    -------
+        The registered listeners.
+
+    """
+    semaphore = asyncio.Semaphore(config.ramp_concurrency)
+    listeners: list[LMKClient] = []
+
+    async def _add() -> None:
+        async with semaphore:
+            try:
+                listeners.append(
+                    await _connect(session, config, LMKClientType.HEADLESS)
+                )
+            except (LMKError, TimeoutError) as error:
+                LOGGER.debug("Listener failed to connect: %s", error)
+                result.failed += 1
+
+    await asyncio.gather(*(_add() for _ in range(config.clients)))
+    result.connected = len(listeners)
+
+    return listeners
+
+
+@dataclass(slots=True)
+class _Deliveries:
+    """Broadcasts in flight, by their ID, and the send time of each."""
+
+    broadcasts: dict[str, tuple[float, LMKFleetBroadcast]] = field(default_factory=dict)
+    # Set when the last broadcast reached every listener
+    delivered: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def received(self, notification: LMKNotification) -> None:
+        """Record the delivery of a broadcast to a listener."""
+        if notification.type != FLEET_NOTIFICATION_TYPE or (
+            (entry := self.broadcasts.get(notification.title or "")) is None
+        ):
+            return
+        elapsed = time.perf_counter() - entry[0]
+        broadcast = entry[1]
+        broadcast.delivered += 1
+        broadcast.latencies.append(elapsed)
+        if broadcast.delivered >= broadcast.expected:
+            broadcast.completion = elapsed
+            self.delivered.set()
+
+
+async def _broadcast(
+    sender: LMKClient,
+    listeners: list[LMKClient],
+    config: LMKFleetConfig,
+    result: LMKFleetResult,
+    deliveries: _Deliveries,
+) -> None:
+    """Broadcast to the fleet, waiting for each broadcast to reach it.
+
+    Args:
+    ----
+        sender: Client to broadcast with.
+        listeners: Listeners of the fleet.
+        config: Fleet simulator configuration.
+        result: Result to add the broadcasts to.
+        deliveries: Deliveries recorded by the listeners.
+
+    """
+    for index in range(config.broadcasts):
+        if index:
+            await asyncio.sleep(config.broadcast_interval)
+
+        broadcast = LMKFleetBroadcast(
+            expected=sum(listener.ws_connected for listener in listeners)
+        )
+        result.broadcasts.append(broadcast)
+        if not broadcast.expected:
+            break
+        broadcast_id = f"{sender.lmk_user_id}-{index}"
+        deliveries.broadcasts[broadcast_id] = (time.perf_counter(), broadcast)
+        deliveries.delivered.clear()
+
+        await sender.ws_send_notification(
+            LMKNotification(type=FLEET_NOTIFICATION_TYPE, title=broadcast_id),
+            TARGETS_ALL_HEADLESS,
+        )
+        try:
+            async with asyncio.timeout(config.broadcast_timeout):
+                await deliveries.delivered.wait()
+        except TimeoutError:
+            LOGGER.warning(
+                "Broadcast %s reached %s of %s listeners",
+                index,
+                broadcast.delivered,
+                broadcast.expected,
+            )
+
+
+async def run_fleet(config: LMKFleetConfig) -> LMKFleetResult:
+    """Run the fleet simulator against a LetMeKnow server.
+
+    Ramps up the configured number of registered headless listeners sharing
+    one session, then broadcasts notifications to all headless clients and
+    records when each listener receives them.
+
+    Args:
+    ----
+        config: Fleet simulator configuration.
+
+    Returns:
+    -------
+        The fleet simulator result.
+
+    """
+    loop = asyncio.get_running_loop()
+    result = LMKFleetResult()
+    deliveries = _Deliveries()
+
+    tracing = tracemalloc.is_tracing()
+    if config.trace_memory and not tracing:
+        tracemalloc.start()
+
+    async with SESSION_MANAGER.session(config.socket_path) as session:
+        memory_start = tracemalloc.get_traced_memory()[0]
+        start = loop.time()
+        listeners = await _ramp_up(session, config, result)
+        result.ramp_duration = loop.time() - start
+        listen_tasks = [
+            asyncio.create_task(
+                listener.ws_listen_for_notifications(deliveries.received)
+            )
+            for listener in listeners
+        ]
+        await asyncio.sleep(0)
+        if config.trace_memory:
+            result.memory = tracemalloc.get_traced_memory()[0] - memory_start
+            if not tracing:
+                tracemalloc.stop()
+
+        LOGGER.info(
+            "Registered %s listeners in %.2fs (%s failed)",
+            result.connected,
+            result.ramp_duration,
+            result.failed,
+        )
+
+        sender = await _connect(session, config, LMKClientType.CLIENT)
+        await _broadcast(sender, listeners, config, result, deliveries)
+
+        result.disconnected = sum(not listener.ws_connected for listener in listeners)
+
+        await asyncio.gather(*(client.ws_close() for client in (*listeners, sender)))
+        await asyncio.gather(*listen_tasks, return_exceptions=True)
+
+    return result
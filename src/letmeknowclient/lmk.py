@@ -3,9 +3,17 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterable
+import contextlib
+from dataclasses import dataclass, field
+from functools import cache
+import inspect
+from json.encoder import encode_basestring_ascii
+import random
 from socket import gaierror
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Final
 
 from aiohttp import (
     ClientConnectionError,
@@ -16,11 +24,16 @@ from aiohttp import (
 )
 from yarl import URL
 
+from .codec import CODEC_JSON, LMKJSONCodec, get_json_codec
 from .const import LOGGER, TARGETS_ALL_CLIENTS, VERSION
-from .exceptions import LMKConnectionError, LMKNotConnectedError
+from .dispatch import LMKCallbackDispatcher
+from .exceptions import LMKConnectionError, LMKError, LMKNotConnectedError
 from .models import (
+    LMKClientStats,
     LMKClientType,
+    LMKLazyNotification,
     LMKNotification,
+    LMKWSBatchResult,
     LMKWSNotification,
     LMKWSRegister,
     LMKWSRequestType,
@@ -28,14 +41,63 @@ from .models import (
     LMKWSResponseSuccess,
     LMKWSResponseType,
 )
+from .session import SESSION_MANAGER
+from .stream import LMKNotificationStream, LMKOverflowPolicy
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+    from concurrent.futures import Executor
 
     from typing_extensions import Self
 
+# Errors raised by decoding a frame that is not valid JSON or not a valid frame
+_FRAME_ERRORS: Final[tuple[type[Exception], ...]] = (
+    AttributeError,
+    KeyError,
+    TypeError,
+    ValueError,
+)
+
+
+@cache
+def _frame_errors(
+    decode_errors: tuple[type[Exception], ...],
+) -> tuple[type[Exception], ...]:
+    """Return the errors raised by handling a malformed frame with a codec."""
+    return _FRAME_ERRORS + decode_errors
+
+
+# Older aiohttp versions always decode text frames to str
+_WS_DECODE_TEXT: Final[bool] = (
+    "decode_text" in inspect.signature(ClientSession.ws_connect).parameters
+)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class LMKClientConfig:
+    """Client options, shared by every client created with the same config."""
+
+    json_codec: LMKJSONCodec = field(default_factory=get_json_codec)
+    # Omit unset notification fields from sent frames
+    compact: bool = False
+    # Number of encoded notifications to keep for re-sending
+    frame_cache_size: int = 128
+    # Decode received notifications on attribute access
+    lazy_decode: bool = False
+    # Skip validating frames from the server
+    trusted_decode: bool = False
+    # Reconnect delays of ws_keep_alive, in seconds
+    backoff_min: float = 0.5
+    backoff_max: float = 60.0
+
+
+@cache
+def _default_config() -> LMKClientConfig:
+    """Get the config shared by clients created without one."""
+    return LMKClientConfig()
+
+
+@dataclass(slots=True)
 class LMKClient:
     """Client to communicate with LetMeKnow."""
 
@@ -46,8 +108,34 @@ class LMKClient:
 
     session: ClientSession | None = None
     request_timeout: int = 10
+    config: LMKClientConfig = field(default_factory=_default_config)
+    # Connect over this Unix socket instead of TCP, the host and port are then
+    # only used for the request URL. A given session connects with its own
+    # connector, so it must have been created for this socket
+    lmk_socket_path: str | None = None
+    stats: LMKClientStats = field(default_factory=LMKClientStats)
+    ws_close_reason: str | None = None
     _close_session: bool = False
     _ws: ClientWebSocketResponse | None = None
+    _ws_closing: bool = False
+    # Created while requests are in flight, idle connections do not hold one
+    _pending: (
+        deque[asyncio.Future[LMKWSResponseSuccess | LMKWSResponseError]] | None
+    ) = field(default=None, repr=False)
+    _reader_task: asyncio.Task[None] | None = field(default=None, repr=False)
+    _register_future: (
+        asyncio.Future[LMKWSResponseSuccess | LMKWSResponseError] | None
+    ) = field(default=None, repr=False)
+    _send_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    _listeners: list[Callable[[LMKNotification], Awaitable[None] | None]] = field(
+        default_factory=list, repr=False
+    )
+    # Streams of the current connection, created on the first one
+    _streams: list[LMKNotificationStream] | None = field(default=None, repr=False)
+    # Created on the first notification sent, listeners never need one
+    _frame_cache: OrderedDict[tuple[Any, ...], str] | None = field(
+        default=None, repr=False
+    )
 
     async def __aenter__(self) -> Self:
         """Async enter.
@@ -71,19 +159,23 @@ class LMKClient:
 
     async def _close(self) -> None:
         """Close open client session."""
+        await self.ws_close()
+
         if self.session and self._close_session:
-            await self.session.close()
+            await SESSION_MANAGER.release(self.session, self.lmk_socket_path)
+            self.session = None
+            self._close_session = False
 
     async def _ws_send(
         self,
-        data: dict[str, Any],
+        data: dict[str, Any] | str,
         wait_for_response: bool | None = None,
     ) -> LMKWSResponseSuccess | LMKWSResponseError:
         """Send data to the websocket server.
 
         Args:
         ----
-            data: Data to send.
+            data: Data to send, or an already encoded JSON string.
             wait_for_response: Wait for a response. Defaults to True.
 
         """
@@ -96,52 +188,325 @@ class LMKClient:
 
         LOGGER.debug("Sending data to websocket server: %s", data)
 
-        try:
-            await self._ws.send_json(data)
-        except (
-            ClientConnectionError,
-            ConnectionResetError,
-            gaierror,
-        ) as error:
-            raise LMKConnectionError from error
-
         if not wait_for_response:
+            # The server still replies, so a cancelled placeholder is queued
+            # to take the reply and keep the later ones aligned
+            (await self._ws_request(data)).cancel()
             return LMKWSResponseSuccess(
                 type=LMKWSResponseType.SUCCESS,
                 succeeded=True,
                 message="No response expected",
             )
 
+        future = await self._ws_request(data)
+
+        # A timed out future is cancelled but stays queued, so its late
+        # response is still consumed in order by the reader.
         async with asyncio.timeout(self.request_timeout):
-            response = await self._ws.receive()
+            return await future
+
+    async def _ws_request(
+        self,
+        data: dict[str, Any] | str,
+    ) -> asyncio.Future[LMKWSResponseSuccess | LMKWSResponseError]:
+        """Send a request frame without waiting for its response.
+
+        Args:
+        ----
+            data: Data to send, or an already encoded JSON string.
 
-        if response.type == WSMsgType.TEXT:
-            # Get the response data
-            response_data: dict[str, Any] = response.json()
+        Returns:
+        -------
+            A future resolved with the response to the request.
 
-            if "error" in response_data:
-                return LMKWSResponseError.from_dict(response_data)
+        """
+        # The server replies in request order, so the future is queued
+        # under the send lock to keep the queue aligned with the socket.
+        future: asyncio.Future[LMKWSResponseSuccess | LMKWSResponseError] = (
+            asyncio.get_running_loop().create_future()
+        )
+        async with self._send_lock:
+            # The connection may have closed while waiting for the lock, and
+            # a future queued after the reader stopped would never resolve
+            if (ws := self._ws) is None or ws.closed:
+                raise LMKNotConnectedError
+
+            if (pending := self._pending) is None:
+                pending = self._pending = deque()
+            pending.append(future)
+            try:
+                await self._ws_send_frame(ws, data)
+            except LMKError:
+                with contextlib.suppress(ValueError):
+                    pending.remove(future)
+                raise
+
+        return future
+
+    def _encode_notification(
+        self,
+        notification: LMKNotification,
+        targets: list[str],
+    ) -> str:
+        """Encode a notification frame.
 
-            return LMKWSResponseSuccess.from_dict(response_data)
+        The encoded notification is kept in a bounded LRU cache keyed by its
+        content, so sending the same notification again only encodes the
+        targets.
 
-        if response.type in (
-            WSMsgType.CLOSE,
-            WSMsgType.CLOSED,
-            WSMsgType.CLOSING,
-        ):
-            self._ws = None
-            return LMKWSResponseError(
-                type=LMKWSResponseType.ERROR,
-                message="Connection closed",
-                error="Connection closed",
+        Args:
+        ----
+            notification: Notification to send.
+            targets: List of targets to send to.
+
+        Returns:
+        -------
+            The encoded frame.
+
+        """
+        config = self.config
+        # The direct encoder is faster than dumping the dicts with stdlib json,
+        # but not faster than the native codecs
+        direct = config.json_codec.name == CODEC_JSON
+
+        if (frame_cache := self._frame_cache) is None:
+            frame_cache = self._frame_cache = OrderedDict()
+
+        key = notification.cache_key
+        if (data := frame_cache.get(key)) is not None:
+            frame_cache.move_to_end(key)
+        else:
+            data = (
+                notification.to_json(compact=config.compact)
+                if direct
+                else config.json_codec.dumps(
+                    notification.to_dict(compact=config.compact)
+                )
             )
+            if config.frame_cache_size > 0:
+                frame_cache[key] = data
+                if len(frame_cache) > config.frame_cache_size:
+                    frame_cache.popitem(last=False)
+
+        targets_data = (
+            f"[{', '.join(map(encode_basestring_ascii, targets))}]"
+            if direct
+            else config.json_codec.dumps(targets)
+        )
 
-        return LMKWSResponseError(
-            type=LMKWSResponseType.ERROR,
-            message="Unused response type",
-            error=response.type.name,
+        return (
+            f'{{"type": "{LMKWSRequestType.NOTIFICATION}", "data": {data}'
+            f', "targets": {targets_data}}}'
         )
 
+    async def _ws_send_frame(
+        self,
+        ws: ClientWebSocketResponse,
+        data: dict[str, Any] | str,
+    ) -> None:
+        """Write a frame to the websocket server.
+
+        Args:
+        ----
+            ws: Connection to write to.
+            data: Data to send, or an already encoded JSON string.
+
+        """
+        try:
+            await ws.send_str(
+                data if isinstance(data, str) else self.config.json_codec.dumps(data)
+            )
+        except (
+            ClientConnectionError,
+            ConnectionResetError,
+            gaierror,
+        ) as error:
+            raise LMKConnectionError from error
+
+    async def _ws_stop_reader(self) -> None:
+        """Stop the reader task of the current connection."""
+        if self._reader_task is not None and not self._reader_task.done():
+            self._reader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader_task
+
+    def _ws_close_streams(self) -> None:
+        """End the notification streams of the connection.
+
+        This also wakes the reader if it is waiting for room in a full stream.
+        """
+        streams, self._streams = self._streams, None
+        for stream in streams or ():
+            stream.close()
+
+    async def _ws_notify(self, notification: LMKNotification) -> None:
+        """Pass a notification to the registered listeners.
+
+        Listeners returning an awaitable are awaited before the next frame is
+        read, which is how a blocking stream applies backpressure.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        """
+        for cb in tuple(self._listeners):
+            try:
+                if (result := cb(notification)) is not None:
+                    await result
+            except Exception:  # noqa: BLE001, PERF203 # pylint: disable=broad-except
+                LOGGER.exception("Error in notification listener")
+
+    def _ws_resolve(
+        self,
+        response: LMKWSResponseSuccess | LMKWSResponseError,
+    ) -> None:
+        """Resolve the oldest pending request with a response.
+
+        Args:
+        ----
+            response: Response to resolve the request with.
+
+        """
+        if not (pending := self._pending):
+            self._pending = None
+            LOGGER.debug("Received response with no pending request: %s", response)
+            return
+
+        # A cancelled request still takes its response, which is dropped
+        future = pending.popleft()
+        if not pending:
+            self._pending = None
+        if not future.done():
+            future.set_result(response)
+
+    def _ws_fail_pending(self, reason: str) -> None:
+        """Resolve all pending requests with a connection closed error.
+
+        Args:
+        ----
+            reason: Reason the connection closed.
+
+        """
+        pending, self._pending = self._pending, None
+        while pending:
+            future = pending.popleft()
+            if not future.done():
+                future.set_result(
+                    LMKWSResponseError(
+                        type=LMKWSResponseType.ERROR,
+                        message="Connection closed",
+                        error=reason,
+                    )
+                )
+
+    async def _ws_handle_data(self, data: str | bytes) -> None:
+        """Handle the payload of a data frame.
+
+        Frames that cannot be decoded are counted and skipped, and a malformed
+        response resolves its request with an error.
+
+        Args:
+        ----
+            data: Payload of a text or binary frame.
+
+        """
+        config = self.config
+        decoded: LMKNotification | LMKWSResponseSuccess | LMKWSResponseError
+        response_data: Any = None
+
+        try:
+            response_data = config.json_codec.loads(data)
+
+            if response_data.get("type") == LMKWSRequestType.NOTIFICATION:
+                if config.lazy_decode:
+                    decoded = LMKLazyNotification(response_data["data"])
+                elif config.trusted_decode:
+                    decoded = LMKWSNotification.from_dict_trusted(response_data).data
+                else:
+                    decoded = LMKWSNotification.from_dict(response_data).data
+            elif config.trusted_decode:
+                decoded = (
+                    LMKWSResponseError.from_dict_trusted(response_data)
+                    if "error" in response_data
+                    else LMKWSResponseSuccess.from_dict_trusted(response_data)
+                )
+            elif "error" in response_data:
+                decoded = LMKWSResponseError.from_dict(response_data)
+            else:
+                decoded = LMKWSResponseSuccess.from_dict(response_data)
+        except _frame_errors(config.json_codec.decode_errors) as error:
+            self.stats.decode_errors += 1
+            LOGGER.warning("Skipping malformed frame: %r (%s)", data[:200], error)
+
+            # Still use up the slot of a malformed response, so the responses
+            # after it are matched with the right requests
+            if (
+                isinstance(response_data, dict)
+                and response_data.get("type") != LMKWSRequestType.NOTIFICATION
+            ):
+                self._ws_resolve(
+                    LMKWSResponseError(
+                        type=LMKWSResponseType.ERROR,
+                        message="Malformed response",
+                        error=str(error),
+                    )
+                )
+            return
+
+        if isinstance(decoded, LMKNotification):
+            self.stats.notifications_received += 1
+            await self._ws_notify(decoded)
+        else:
+            self.stats.responses_received += 1
+            self._ws_resolve(decoded)
+
+    async def _ws_reader(self, ws: ClientWebSocketResponse) -> None:
+        """Read frames from the websocket server.
+
+        Pushed notifications are passed to the listeners, while responses
+        resolve the pending requests. Control frames are skipped and the
+        reader only stops when the connection closes or errors.
+
+        Args:
+        ----
+            ws: Connection to read from.
+
+        """
+        reason = "Connection closed"
+        try:
+            while True:
+                message = await ws.receive()
+
+                if message.type in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    await self._ws_handle_data(message.data)
+                    continue
+
+                if message.type == WSMsgType.CLOSE:
+                    reason = f"Connection closed ({message.data}): {message.extra}"
+                    break
+
+                if message.type in (WSMsgType.CLOSING, WSMsgType.CLOSED):
+                    break
+
+                if message.type == WSMsgType.ERROR:
+                    reason = f"Connection error: {ws.exception() or message.data}"
+                    break
+
+                self.stats.ignored_frames += 1
+                LOGGER.debug("Ignoring %s message", message.type.name)
+        finally:
+            LOGGER.debug("Websocket reader stopped: %s", reason)
+            self.ws_close_reason = reason
+            # A new connection is only set once this reader has stopped
+            self._ws = None
+
+            if not ws.closed:
+                await ws.close()
+
+            self._ws_fail_pending(reason)
+            self._ws_close_streams()
+
     @property
     def ws_connected(self) -> bool:
         """Check if the websocket is connected.
@@ -153,6 +518,39 @@ class LMKClient:
         """
         return self._ws is not None and not self._ws.closed
 
+    @property
+    def ws_pending(self) -> int:
+        """Number of requests awaiting a response.
+
+        Returns
+        -------
+            The number of requests in flight on the connection.
+
+        """
+        return len(self._pending) if self._pending is not None else 0
+
+    async def ws_close(self) -> None:
+        """Close the websocket connection."""
+        self._ws_closing = True
+        await self._ws_drop()
+
+    async def _ws_drop(self) -> None:
+        """Close the current connection, leaving ws_keep_alive to reconnect."""
+        # A reader waiting on a full stream would not see the connection close
+        self._ws_close_streams()
+
+        if self._ws is not None:
+            await self._ws.close()
+
+        await self.ws_wait_closed()
+
+    async def ws_wait_closed(self) -> None:
+        """Wait until the websocket connection is closed."""
+        if (reader_task := self._reader_task) is not None and not reader_task.done():
+            # Cancelling the caller does not cancel the reader, while the
+            # reader being cancelled does not raise in the caller
+            await asyncio.wait((reader_task,))
+
     async def ws_connect(self) -> bool:
         """Connect to LetMeKnow websocket server.
 
@@ -167,22 +565,36 @@ class LMKClient:
             port=self.lmk_port,
         ).joinpath("websocket")
 
-        LOGGER.debug("Connecting to websocket server: %s", url)
-
         headers = {
             "User-Agent": f"LMKClientPy/{VERSION}",
         }
 
         if self.session is None:
-            self.session = ClientSession()
+            # Clients without a session share one, along with its connector
+            self.session = SESSION_MANAGER.acquire(self.lmk_socket_path)
             self._close_session = True
 
+        LOGGER.debug(
+            "Connecting to websocket server: %s%s",
+            url,
+            f" (via {self.lmk_socket_path})"
+            if self.lmk_socket_path and self._close_session
+            else "",
+        )
+
+        # Let a bytes-native codec parse text frames straight from the
+        # payload, skipping the UTF-8 decode to an intermediate str
+        ws_options: dict[str, Any] = {}
+        if _WS_DECODE_TEXT and self.config.json_codec.decodes_bytes:
+            ws_options["decode_text"] = False
+
         try:
             async with asyncio.timeout(self.request_timeout):
-                self._ws = await self.session.ws_connect(
+                ws = await self.session.ws_connect(
                     url=url,
                     headers=headers,
                     heartbeat=30,
+                    **ws_options,
                 )
         except (
             asyncio.TimeoutError,
@@ -192,31 +604,120 @@ class LMKClient:
         ) as error:
             raise LMKConnectionError from error
 
+        # Stop reading any previous connection before replacing it, and fail
+        # its requests so their responses are not expected on the new one
+        await self._ws_stop_reader()
+        self._ws_fail_pending("Reconnected")
+
+        self._ws = ws
+        self._ws_closing = False
+        self._register_future = None
+        self._reader_task = asyncio.create_task(self._ws_reader(ws))
+
         return True
 
-    async def ws_keep_alive(self) -> None:
-        """Keep the websocket connection alive."""
-        while self.ws_connected:
-            await asyncio.sleep(10)
+    async def ws_keep_alive(
+        self,
+        backoff_min: float | None = None,
+        backoff_max: float | None = None,
+    ) -> None:
+        """Keep the websocket connection alive.
 
-        LOGGER.info("Websocket connection closed, reconnecting")
+        Reconnects and registers as soon as the connection closes, retrying
+        with capped exponential backoff and full jitter. Runs until cancelled
+        or the connection is closed with ws_close.
 
-        if not await self.ws_connect():
-            LOGGER.error("Failed to reconnect to websocket server")
-            return
+        Args:
+        ----
+            backoff_min: Delay before the first retry, in seconds. Defaults to
+                the config's.
+            backoff_max: Maximum delay between retries, in seconds. Defaults to
+                the config's.
 
-        if (
-            register_response := await self.ws_register()
-        ).type != LMKWSResponseType.REGISTER:
-            LOGGER.error(
-                "Failed to register with websocket server: %s", register_response
-            )
-            return
+        """
+        if backoff_min is None:
+            backoff_min = self.config.backoff_min
+        if backoff_max is None:
+            backoff_max = self.config.backoff_max
+        attempt = 0
+
+        while True:
+            await self.ws_wait_closed()
+
+            if self._ws_closing:
+                return
+
+            if self.ws_connected:
+                # The connection was replaced while waiting
+                continue
+
+            if attempt:
+                delay = random.uniform(0, min(backoff_max, backoff_min * 2**attempt))  # noqa: S311
+                LOGGER.debug("Reconnecting in %.2fs", delay)
+                await asyncio.sleep(delay)
+
+                if self._ws_closing:
+                    # Closed with ws_close while waiting to retry
+                    return
+
+            LOGGER.info("Websocket connection closed, reconnecting")
+            attempt += 1
+
+            try:
+                # Sends queued by other tasks go out behind the register frame,
+                # without waiting for it to be acknowledged
+                await self.connect()
+                register_response = await self.ws_wait_registered()
+            except (LMKError, TimeoutError) as error:
+                LOGGER.warning("Failed to reconnect to websocket server: %s", error)
+                # Do not stay connected without being registered
+                await self._ws_drop()
+                continue
+
+            if register_response.type != LMKWSResponseType.REGISTER:
+                LOGGER.error(
+                    "Failed to register with websocket server: %s", register_response
+                )
+                await self._ws_drop()
+                continue
+
+            LOGGER.info("Reconnected to websocket server")
+            self.stats.reconnects += 1
+            attempt = 0
+
+    async def connect(self) -> None:
+        """Connect to the websocket server and register.
+
+        The register frame is sent straight after the handshake, without
+        waiting for its response. Notifications can be sent as soon as this
+        returns, as the server handles them after the register frame. Use
+        ws_wait_registered to check the registration succeeded.
+        """
+        await self.ws_connect()
+
+        LOGGER.debug("Registering with the websocket server as: %s", self.lmk_user_id)
+
+        self._register_future = await self._ws_request(
+            LMKWSRegister(
+                type=LMKWSRequestType.REGISTER,
+                user_id=self.lmk_user_id,
+            ).to_dict()
+        )
+
+    async def ws_wait_registered(self) -> LMKWSResponseSuccess | LMKWSResponseError:
+        """Wait for the response to the register frame sent by connect.
+
+        Returns
+        -------
+            The response from the websocket server.
 
-        LOGGER.info("Reconnected to websocket server")
+        """
+        if self._register_future is None:
+            raise LMKNotConnectedError
 
-        # Continue to keep the connection alive
-        await self.ws_keep_alive()
+        # Shielded, so a timed out wait does not drop the response for others
+        async with asyncio.timeout(self.request_timeout):
+            return await asyncio.shield(self._register_future)
 
     async def ws_register(self) -> LMKWSResponseSuccess | LMKWSResponseError:
         """Register with the websocket server.
@@ -258,32 +759,235 @@ class LMKClient:
         LOGGER.debug("Sending notification to the websocket server: %s", notification)
         LOGGER.debug("Notification targets: %s", targets)
 
-        return await self._ws_send(
-            LMKWSNotification(
-                type=LMKWSRequestType.NOTIFICATION,
-                data=notification,
-                targets=targets,
-            ).to_dict()
+        return await self._ws_send(self._encode_notification(notification, targets))
+
+    async def ws_send_notifications(
+        self,
+        notifications: Iterable[tuple[LMKNotification, list[str] | None]]
+        | AsyncIterable[tuple[LMKNotification, list[str] | None]],
+        window: int = 64,
+    ) -> LMKWSBatchResult:
+        """Send many notifications to the websocket server.
+
+        Up to `window` notifications are in flight at once on the connection.
+        A notification that fails to send, or times out, gets an error response
+        instead of aborting the rest of the batch.
+
+        Args:
+        ----
+            notifications: Pairs of notification and targets to send.
+            window: Maximum number of notifications awaiting a response.
+
+        Returns:
+        -------
+            The responses from the websocket server, in the order sent.
+
+        """
+        if window < 1:
+            msg = f"Window must be at least 1, not {window}"
+            raise ValueError(msg)
+
+        semaphore = asyncio.Semaphore(window)
+        tasks: list[asyncio.Task[LMKWSResponseSuccess | LMKWSResponseError]] = []
+
+        async def _send(
+            notification: LMKNotification,
+            targets: list[str] | None,
+        ) -> LMKWSResponseSuccess | LMKWSResponseError:
+            try:
+                return await self.ws_send_notification(notification, targets)
+            except TimeoutError:
+                return LMKWSResponseError(
+                    type=LMKWSResponseType.ERROR,
+                    message="Timed out waiting for response",
+                    error="TimeoutError",
+                )
+            except LMKError as error:
+                return LMKWSResponseError(
+                    type=LMKWSResponseType.ERROR,
+                    message="Failed to send notification",
+                    error=str(error),
+                )
+            finally:
+                semaphore.release()
+
+        async def _iterate() -> AsyncIterator[tuple[LMKNotification, list[str] | None]]:
+            if isinstance(notifications, AsyncIterable):
+                async for item in notifications:
+                    yield item
+            else:
+                for item in notifications:
+                    yield item
+
+        start = time.perf_counter()
+        try:
+            async for notification, targets in _iterate():
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(_send(notification, targets)))
+            responses = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        result = LMKWSBatchResult(
+            responses=list(responses),
+            duration=time.perf_counter() - start,
+        )
+        LOGGER.debug(
+            "Sent %s notifications in %.3fs (%.1f/s)",
+            len(result.responses),
+            result.duration,
+            result.throughput,
         )
+        return result
 
-    async def ws_listen_for_notifications(
+    async def ws_listen_for_notifications(  # pylint: disable=too-many-arguments
         self,
-        cb: Callable[[LMKNotification], None],
+        cb: Callable[[LMKNotification], Awaitable[None] | None],
+        *,
+        max_concurrency: int = 16,
+        ordered: bool = False,
+        blocking: bool = False,
+        executor: Executor | None = None,
     ) -> None:
         """Listen for notifications.
 
+        Synchronous callbacks run inline on the event loop. Coroutine
+        callbacks, and synchronous ones marked as blocking, run off the
+        reader so a slow callback does not stall reading the socket.
+
         Args:
         ----
             cb: Callback to call when a notification is received.
+            max_concurrency: Maximum number of callbacks in flight.
+            ordered: Run callbacks one at a time, in the order received.
+            blocking: Run a synchronous callback in the executor.
+            executor: Executor for blocking callbacks. Defaults to the loop's.
 
         """
-        if self._ws is None or self._ws.closed:
+        if self._ws is None or self._ws.closed or self._reader_task is None:
             raise LMKNotConnectedError
 
-        async for message in self._ws:
-            if message.type == 1:
-                response_data: dict[str, Any] = message.json()
-                notification = LMKWSNotification.from_dict(response_data)
-                cb(notification.data)
-            else:
-                break
+        listener: Callable[[LMKNotification], Awaitable[None] | None] = cb
+        dispatcher: LMKCallbackDispatcher | None = None
+        if blocking or inspect.iscoroutinefunction(cb):
+            listener = dispatcher = LMKCallbackDispatcher(
+                cb,
+                max_concurrency=max_concurrency,
+                ordered=ordered,
+                blocking=blocking,
+                executor=executor,
+            )
+
+        # Notifications are read by the reader task, which also handles the
+        # responses to sends, so listening and sending share one connection.
+        self._listeners.append(listener)
+        try:
+            await self.ws_wait_closed()
+        except asyncio.CancelledError:
+            if dispatcher is not None:
+                await dispatcher.close(cancel=True)
+            raise
+        finally:
+            self._listeners.remove(listener)
+
+        if dispatcher is not None:
+            await dispatcher.close()
+
+    async def ws_listen_for_notification_batches(
+        self,
+        cb: Callable[[list[LMKNotification]], Awaitable[None] | None],
+        *,
+        max_batch_size: int = 100,
+        max_batch_delay: float = 0.0,
+        maxsize: int = 1000,
+    ) -> None:
+        """Listen for notifications, delivered in batches.
+
+        Each batch holds the notifications buffered when the callback is due,
+        up to `max_batch_size`. With a `max_batch_delay`, a batch waits up to
+        that many seconds after its first notification to fill up.
+
+        Args:
+        ----
+            cb: Callback to call with each batch of notifications.
+            max_batch_size: Maximum number of notifications in a batch.
+            max_batch_delay: Maximum time to wait for a batch to fill, in seconds.
+            maxsize: Maximum number of buffered notifications, 0 for no limit.
+
+        """
+        if max_batch_size < 1:
+            msg = f"Batch size must be at least 1, not {max_batch_size}"
+            raise ValueError(msg)
+
+        loop = asyncio.get_running_loop()
+
+        async with self.notifications(maxsize=maxsize) as stream:
+            async for notification in stream:
+                batch = [notification, *stream.drain(max_batch_size - 1)]
+                deadline = loop.time() + max_batch_delay
+
+                while len(batch) < max_batch_size and loop.time() < deadline:
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            batch.append(await anext(stream))
+                    except (TimeoutError, StopAsyncIteration):
+                        break
+                    batch.extend(stream.drain(max_batch_size - len(batch)))
+
+                try:
+                    if (result := cb(batch)) is not None:
+                        await result
+                except Exception:  # noqa: BLE001 # pylint: disable=broad-except
+                    LOGGER.exception("Error in notification listener")
+
+    def notifications(
+        self,
+        maxsize: int = 1000,
+        overflow: LMKOverflowPolicy = LMKOverflowPolicy.BLOCK,
+    ) -> LMKNotificationStream:
+        """Get a stream of received notifications.
+
+        The stream ends when the connection closes or the stream is closed.
+
+        With the BLOCK overflow policy, a full stream stops the connection
+        from being read until the stream is read from. This also holds back
+        the responses to sends, so read the stream in a task other than the
+        one sending, or drop notifications instead.
+
+        Args:
+        ----
+            maxsize: Maximum number of buffered notifications, 0 for no limit.
+            overflow: What to do with a notification when the buffer is full.
+
+        Returns:
+        -------
+            An async iterator of notifications.
+
+        """
+        if self._ws is None or self._ws.closed or self._reader_task is None:
+            raise LMKNotConnectedError
+
+        def _detach() -> None:
+            with contextlib.suppress(ValueError):
+                self._listeners.remove(stream.put)
+            # Do not keep the closed stream, and its buffer, for the
+            # rest of the connection
+            if (streams := self._streams) is not None:
+                with contextlib.suppress(ValueError):
+                    streams.remove(stream)
+                if not streams:
+                    self._streams = None
+
+        stream = LMKNotificationStream(
+            maxsize=maxsize,
+            overflow=overflow,
+            on_close=_detach,
+        )
+        self._listeners.append(stream.put)
+        if (streams := self._streams) is None:
+            streams = self._streams = []
+        streams.append(stream)
+
+        return stream
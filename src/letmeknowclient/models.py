@@ -4,7 +4,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import StrEnum
-from typing import Any, Self
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Final, Self
+
+
+def _json_value(value: Any) -> str:
+    """Encode a scalar value the same way as json.dumps."""
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    # A bool is an int, but is encoded as true or false
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int.__repr__(value)
+    return json.dumps(value)
 
 
 class LMKClientType(StrEnum):
@@ -14,6 +28,17 @@ class LMKClientType(StrEnum):
     HEADLESS = "headless"
 
 
+@dataclass(slots=True)
+class LMKClientStats:
+    """Client counters."""
+
+    notifications_received: int = 0
+    responses_received: int = 0
+    decode_errors: int = 0
+    ignored_frames: int = 0
+    reconnects: int = 0
+
+
 @dataclass(slots=True)
 class LMKNotification:
     """Notification."""
@@ -39,8 +64,57 @@ class LMKNotification:
             timeout=result.get("timeout"),
         )
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert class to a dict."""
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        get = result.get
+        return cls(
+            get("type"),
+            get("title"),
+            get("subtitle"),
+            get("content"),
+            LMKNotificationImage(image["url"]) if (image := get("image")) else None,
+            get("timeout"),
+        )
+
+    @property
+    def cache_key(self) -> tuple[Any, ...]:
+        """Key identifying the content of the notification.
+
+        The types are part of the key, as values like `1`, `1.0` and `True`
+        are equal but are encoded differently.
+        """
+        values = (
+            self.type,
+            self.title,
+            self.subtitle,
+            self.content,
+            self.image.url if self.image else None,
+            self.timeout,
+        )
+        return (*values, *map(type, values))
+
+    def to_dict(self, *, compact: bool = False) -> dict[str, Any]:
+        """Convert class to a dict.
+
+        In compact mode fields that are not set are left out.
+        """
+        if compact:
+            result: dict[str, Any] = {}
+            if self.type is not None:
+                result["type"] = str(self.type)
+            if self.title is not None:
+                result["title"] = self.title
+            if self.subtitle is not None:
+                result["subtitle"] = self.subtitle
+            if self.content is not None:
+                result["content"] = self.content
+            if self.image:
+                result["image"] = self.image.to_dict()
+            if self.timeout is not None:
+                result["timeout"] = self.timeout
+            return result
+
         return {
             "type": str(self.type),
             "title": self.title,
@@ -50,6 +124,166 @@ class LMKNotification:
             "timeout": self.timeout,
         }
 
+    def to_json(self, *, compact: bool = False) -> str:
+        """Convert class to a JSON string, as json.dumps of to_dict."""
+        # With every field set there is nothing to leave out
+        if compact and None in (
+            self.type,
+            self.title,
+            self.subtitle,
+            self.content,
+            self.image,
+            self.timeout,
+        ):
+            parts: list[str] = []
+            if self.type is not None:
+                parts.append(f'"type": {encode_basestring_ascii(str(self.type))}')
+            if self.title is not None:
+                parts.append(f'"title": {_json_value(self.title)}')
+            if self.subtitle is not None:
+                parts.append(f'"subtitle": {_json_value(self.subtitle)}')
+            if self.content is not None:
+                parts.append(f'"content": {_json_value(self.content)}')
+            if self.image:
+                parts.append(f'"image": {self.image.to_json()}')
+            if self.timeout is not None:
+                parts.append(f'"timeout": {_json_value(self.timeout)}')
+            return f"{{{', '.join(parts)}}}"
+
+        return (
+            f'{{"type": {encode_basestring_ascii(str(self.type))}'
+            f', "title": {_json_value(self.title)}'
+            f', "subtitle": {_json_value(self.subtitle)}'
+            f', "content": {_json_value(self.content)}'
+            f', "image": {self.image.to_json() if self.image else "null"}'
+            f', "timeout": {_json_value(self.timeout)}}}'
+        )
+
+
+class LMKLazyNotification(LMKNotification):
+    """Notification decoded lazily from a received frame.
+
+    Fields are read from the frame data when accessed, and the image is only
+    built the first time it is read. Use it in place of LMKNotification when
+    most notifications are dropped after checking a few fields.
+
+    It compares equal to a LMKNotification with the same fields. It is not a
+    dataclass instance of its own, so use to_notification before passing it
+    to dataclasses.replace or asdict.
+    """
+
+    __slots__ = ("_data", "_image")
+
+    def __init__(self, data: dict[str, Any]) -> None:  # pylint: disable=super-init-not-called
+        """Initialize from the data of a notification frame."""
+        if not isinstance(data, dict):
+            msg = f"Notification data must be a dict, not {type(data).__name__}"
+            raise TypeError(msg)
+
+        self._data = data
+        self._image: LMKNotificationImage | None | bool = False
+
+    @classmethod
+    def from_dict(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a dict."""
+        return cls(result)
+
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        return cls(result)
+
+    @property
+    def type(self) -> str | None:
+        """Type of the notification."""
+        return self._data.get("type")
+
+    @type.setter
+    def type(self, value: str | None) -> None:
+        self._data["type"] = value
+
+    @property
+    def title(self) -> str | None:
+        """Title of the notification."""
+        return self._data.get("title")
+
+    @title.setter
+    def title(self, value: str | None) -> None:
+        self._data["title"] = value
+
+    @property
+    def subtitle(self) -> str | None:
+        """Subtitle of the notification."""
+        return self._data.get("subtitle")
+
+    @subtitle.setter
+    def subtitle(self, value: str | None) -> None:
+        self._data["subtitle"] = value
+
+    @property
+    def content(self) -> str | None:
+        """Content of the notification."""
+        return self._data.get("content")
+
+    @content.setter
+    def content(self, value: str | None) -> None:
+        self._data["content"] = value
+
+    @property
+    def image(self) -> LMKNotificationImage | None:
+        """Image of the notification, built on first access."""
+        if self._image is False:
+            self._image = (
+                LMKNotificationImage.from_dict(self._data["image"])
+                if self._data.get("image")
+                else None
+            )
+        return self._image  # type: ignore[return-value]
+
+    @image.setter
+    def image(self, value: LMKNotificationImage | None) -> None:
+        self._image = value
+
+    @property
+    def timeout(self) -> int | None:
+        """Timeout of the notification."""
+        return self._data.get("timeout")
+
+    @timeout.setter
+    def timeout(self, value: int | None) -> None:
+        self._data["timeout"] = value
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the fields with another notification."""
+        if not isinstance(other, LMKNotification):
+            return NotImplemented
+        return (
+            self.type,
+            self.title,
+            self.subtitle,
+            self.content,
+            self.image,
+            self.timeout,
+        ) == (
+            other.type,
+            other.title,
+            other.subtitle,
+            other.content,
+            other.image,
+            other.timeout,
+        )
+
+    def to_notification(self) -> LMKNotification:
+        """Decode all fields into a LMKNotification."""
+        return LMKNotification(
+            type=self.type,
+            title=self.title,
+            subtitle=self.subtitle,
+            content=self.content,
+            image=self.image,
+            timeout=self.timeout,
+        )
+
 
 @dataclass(slots=True)
 class LMKNotificationImage:
@@ -64,12 +298,21 @@ class LMKNotificationImage:
             url=result["url"],
         )
 
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        return cls(result["url"])
+
     def to_dict(self) -> dict[str, Any]:
         """Convert class to a dict."""
         return {
             "url": self.url,
         }
 
+    def to_json(self) -> str:
+        """Convert class to a JSON string, as json.dumps of to_dict."""
+        return f'{{"url": {_json_value(self.url)}}}'
+
 
 class LMKWSRequestType(StrEnum):
     """Enum of websocket request type."""
@@ -87,6 +330,15 @@ class LMKWSResponseType(StrEnum):
     SUCCESS = "success"  # Generic success response, not sent by the server
 
 
+# Value to member lookups, avoiding the slow Enum call in trusted decoding
+REQUEST_TYPES: Final[dict[str, LMKWSRequestType]] = {
+    member.value: member for member in LMKWSRequestType
+}
+RESPONSE_TYPES: Final[dict[str, LMKWSResponseType]] = {
+    member.value: member for member in LMKWSResponseType
+}
+
+
 @dataclass(slots=True)
 class LMKWSRegister:
     """Websocket register client."""
@@ -102,6 +354,11 @@ class LMKWSRegister:
             user_id=result["userID"],
         )
 
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        return cls(REQUEST_TYPES[result["type"]], result["userID"])
+
     def to_dict(self) -> dict[str, Any]:
         """Convert class to a dict."""
         return {
@@ -127,14 +384,38 @@ class LMKWSNotification:
             targets=result["targets"],
         )
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert class to a dict."""
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        return cls(
+            REQUEST_TYPES[result["type"]],
+            LMKNotification.from_dict_trusted(result["data"]),
+            result["targets"],
+        )
+
+    def to_dict(self, *, compact: bool = False) -> dict[str, Any]:
+        """Convert class to a dict.
+
+        In compact mode unset notification fields are left out.
+        """
         return {
             "type": str(self.type),
-            "data": self.data.to_dict(),
+            "data": self.data.to_dict(compact=compact),
             "targets": self.targets,
         }
 
+    def to_json(self, *, compact: bool = False) -> str:
+        """Convert class to a JSON string, as json.dumps of to_dict.
+
+        The frame is written directly, without building the intermediate
+        dicts of to_dict.
+        """
+        return (
+            f'{{"type": {encode_basestring_ascii(str(self.type))}'
+            f', "data": {self.data.to_json(compact=compact)}'
+            f', "targets": [{", ".join(map(_json_value, self.targets))}]}}'
+        )
+
 
 @dataclass(slots=True)
 class LMKWSResponseError:
@@ -153,6 +434,15 @@ class LMKWSResponseError:
             error=result["error"],
         )
 
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        return cls(
+            RESPONSE_TYPES[result["type"]],
+            result["message"],
+            result["error"],
+        )
+
     def to_dict(self) -> dict[str, Any]:
         """Convert class to a dict."""
         return {
@@ -179,6 +469,15 @@ class LMKWSResponseSuccess:
             message=result["message"],
         )
 
+    @classmethod
+    def from_dict_trusted(cls, result: dict[str, Any]) -> Self:
+        """Initialize from a trusted dict, skipping validation."""
+        return cls(
+            RESPONSE_TYPES[result["type"]],
+            result["succeeded"],
+            result["message"],
+        )
+
     def to_dict(self) -> dict[str, Any]:
         """Convert class to a dict."""
         return {
@@ -186,3 +485,27 @@ class LMKWSResponseSuccess:
             "succeeded": self.succeeded,
             "message": self.message,
         }
+
+
+@dataclass(slots=True)
+class LMKWSBatchResult:
+    """Websocket batch send result."""
+
+    responses: list[LMKWSResponseSuccess | LMKWSResponseError]
+    duration: float
+
+    @property
+    def succeeded(self) -> int:
+        """Number of notifications sent successfully."""
+        return sum(
+            1
+            for response in self.responses
+            if response.type == LMKWSResponseType.NOTIFICATION_SENT
+        )
+
+    @property
+    def throughput(self) -> float:
+        """Notifications sent per second."""
+        if self.duration <= 0:
+            return 0.0
+        return len(self.responses) / self.duration
@@ -0,0 +1,195 @@
+"""Pool of clients for communication with LetMeKnow."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .const import LOGGER, TARGETS_ALL_CLIENTS
+from .exceptions import LMKError, LMKNotConnectedError
+from .lmk import LMKClient, LMKClientConfig
+from .models import LMKClientType
+from .session import SESSION_MANAGER
+from .utils import connect_client, generate_user_id
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+    from typing_extensions import Self
+
+    from .models import LMKNotification, LMKWSResponseError, LMKWSResponseSuccess
+
+
+@dataclass
+class LMKClientPool:
+    """Pool of registered LetMeKnow connections to spread sends across."""
+
+    lmk_host: str
+    lmk_port: int
+    lmk_client_type: LMKClientType = LMKClientType.HEADLESS
+    size: int = 4
+
+    session: ClientSession | None = None
+    request_timeout: int = 10
+    config: LMKClientConfig = field(default_factory=LMKClientConfig)
+    lmk_socket_path: str | None = None
+    replace_interval: float = 5.0
+    _close_session: bool = False
+    _clients: list[LMKClient] = field(default_factory=list, repr=False)
+    _monitors: set[asyncio.Task[None]] = field(default_factory=set, repr=False)
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The LMKClientPool object.
+
+        """
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        await self.close()
+
+    @property
+    def clients(self) -> list[LMKClient]:
+        """Connected clients in the pool.
+
+        Returns
+        -------
+            The clients with an open connection.
+
+        """
+        return [client for client in self._clients if client.ws_connected]
+
+    async def connect(self) -> None:
+        """Open and register all connections in the pool."""
+        if self.session is None:
+            self.session = SESSION_MANAGER.acquire(self.lmk_socket_path)
+            self._close_session = True
+
+        results = await asyncio.gather(
+            *(self._connect_client() for _ in range(self.size)),
+            return_exceptions=True,
+        )
+
+        # Close the connections that did open, and release the session, as
+        # __aexit__ does not run when __aenter__ raises
+        if errors := [
+            result for result in results if isinstance(result, BaseException)
+        ]:
+            await self.close()
+            raise errors[0]
+
+    async def close(self) -> None:
+        """Close all connections in the pool."""
+        # Taken first, as a monitor woken by the cancel removes its client
+        clients = list(self._clients)
+
+        for task in self._monitors:
+            task.cancel()
+        await asyncio.gather(*self._monitors, return_exceptions=True)
+
+        await asyncio.gather(*(client.ws_close() for client in clients))
+        self._clients.clear()
+
+        if self.session and self._close_session:
+            await SESSION_MANAGER.release(self.session, self.lmk_socket_path)
+            self.session = None
+            self._close_session = False
+
+    async def _connect_client(self) -> LMKClient:
+        """Open and register a new connection.
+
+        Returns
+        -------
+            The registered client.
+
+        """
+        client = await connect_client(
+            LMKClient(
+                lmk_host=self.lmk_host,
+                lmk_port=self.lmk_port,
+                lmk_client_type=self.lmk_client_type,
+                lmk_user_id=generate_user_id(self.lmk_client_type),
+                session=self.session,
+                request_timeout=self.request_timeout,
+                config=self.config,
+                lmk_socket_path=self.lmk_socket_path,
+            )
+        )
+        self._clients.append(client)
+
+        task = asyncio.create_task(self._monitor_client(client))
+        self._monitors.add(task)
+        task.add_done_callback(self._monitors.discard)
+
+        return client
+
+    async def _monitor_client(self, client: LMKClient) -> None:
+        """Replace a client once its connection closes.
+
+        Args:
+        ----
+            client: Client to monitor.
+
+        """
+        await client.ws_wait_closed()
+
+        with contextlib.suppress(ValueError):
+            self._clients.remove(client)
+
+        # Runs until replaced, or until the pool cancels it on close
+        while True:
+            LOGGER.info("Pool connection %s closed, replacing", client.lmk_user_id)
+            try:
+                await self._connect_client()
+            except LMKError as error:
+                LOGGER.warning("Failed to replace pool connection: %s", error)
+                await asyncio.sleep(self.replace_interval)
+            else:
+                return
+
+    def _least_loaded(self) -> LMKClient:
+        """Get the connected client with the fewest requests in flight.
+
+        Returns
+        -------
+            The least loaded client.
+
+        """
+        if not (clients := self.clients):
+            raise LMKNotConnectedError
+
+        return min(clients, key=lambda client: client.ws_pending)
+
+    async def ws_send_notification(
+        self,
+        notification: LMKNotification,
+        targets: list[str] | None = None,
+    ) -> LMKWSResponseSuccess | LMKWSResponseError:
+        """Send a notification on the least loaded connection.
+
+        Args:
+        ----
+            notification: Notification to send.
+            targets: List of targets to send to. Defaults to all clients.
+
+        Returns:
+        -------
+            The response from the websocket server.
+
+        """
+        if targets is None:
+            targets = TARGETS_ALL_CLIENTS
+
+        return await self._least_loaded().ws_send_notification(notification, targets)
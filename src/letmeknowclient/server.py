@@ -0,0 +1,198 @@
+"""Stand-in LetMeKnow server for local testing and benchmarks."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import WSMsgType, web
+
+from .const import LOGGER
+from .models import (
+    LMKWSRequestType,
+    LMKWSResponseError,
+    LMKWSResponseSuccess,
+    LMKWSResponseType,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+
+@dataclass
+class LMKTestServer:
+    """Minimal in-process implementation of the LetMeKnow websocket server.
+
+    Clients register with a user ID, and notifications are forwarded to every
+    registered client matching one of the targets (e.g. `headless-*`), or to
+    all clients when there are no targets.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    # Also listen on this Unix socket
+    path: str | None = None
+
+    clients: dict[str, web.WebSocketResponse] = field(default_factory=dict)
+    notifications_sent: int = 0
+    _runner: web.AppRunner | None = field(default=None, repr=False)
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The LMKTestServer object.
+
+        """
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start the server.
+
+        With port 0 a free port is picked, and `port` is updated to it.
+        """
+        app = web.Application()
+        app.router.add_get("/websocket", self._handle_websocket)
+
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        self.port = self._runner.addresses[0][1]
+        LOGGER.debug("Test server listening on %s:%s", self.host, self.port)
+
+        if self.path is not None:
+            await web.UnixSite(self._runner, self.path).start()
+            LOGGER.debug("Test server listening on %s", self.path)
+
+    async def stop(self) -> None:
+        """Stop the server and close all connections."""
+        for ws in list(self.clients.values()):
+            await ws.close()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+        if self.path is not None:
+            Path(self.path).unlink(missing_ok=True)
+
+    async def _handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Handle a websocket connection.
+
+        Args:
+        ----
+            request: Request to upgrade.
+
+        Returns:
+        -------
+            The websocket response.
+
+        """
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+
+        user_id: str | None = None
+        try:
+            async for message in ws:
+                if message.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    continue
+
+                try:
+                    data: dict[str, Any] = json.loads(message.data)
+                    request_type = data["type"]
+                except (KeyError, TypeError, ValueError):
+                    await self._send_error(ws, "Invalid request")
+                    continue
+
+                if request_type == LMKWSRequestType.REGISTER:
+                    user_id = str(data.get("userID"))
+                    self.clients[user_id] = ws
+                    await ws.send_json(
+                        LMKWSResponseSuccess(
+                            type=LMKWSResponseType.REGISTER,
+                            succeeded=True,
+                            message=f"Registered as {user_id}",
+                        ).to_dict()
+                    )
+                elif request_type == LMKWSRequestType.NOTIFICATION:
+                    if user_id is None:
+                        await self._send_error(ws, "Not registered")
+                        continue
+                    await self._send_notification(ws, message.data, data)
+                else:
+                    await self._send_error(ws, f"Unknown request type: {request_type}")
+        finally:
+            if user_id is not None and self.clients.get(user_id) is ws:
+                del self.clients[user_id]
+
+        return ws
+
+    async def _send_notification(
+        self,
+        ws: web.WebSocketResponse,
+        raw: str | bytes,
+        data: dict[str, Any],
+    ) -> None:
+        """Forward a notification to the matching clients.
+
+        Args:
+        ----
+            ws: Connection of the sender.
+            raw: Notification frame as received, forwarded unchanged.
+            data: Decoded notification frame.
+
+        """
+        targets: list[str] = data.get("targets") or []
+        text = raw if isinstance(raw, str) else raw.decode()
+
+        sent = 0
+        for user_id, client in list(self.clients.items()):
+            if targets and not any(fnmatchcase(user_id, target) for target in targets):
+                continue
+            if client.closed:
+                continue
+            await client.send_str(text)
+            sent += 1
+
+        self.notifications_sent += sent
+        await ws.send_json(
+            LMKWSResponseSuccess(
+                type=LMKWSResponseType.NOTIFICATION_SENT,
+                succeeded=True,
+                message=f"Notification sent to {sent} clients",
+            ).to_dict()
+        )
+
+    @staticmethod
+    async def _send_error(ws: web.WebSocketResponse, message: str) -> None:
+        """Send an error response.
+
+        Args:
+        ----
+            ws: Connection to send to.
+            message: Error message.
+
+        """
+        await ws.send_json(
+            LMKWSResponseError(
+                type=LMKWSResponseType.ERROR,
+                message=message,
+                error=message,
+            ).to_dict()
+        )
@@ -0,0 +1,151 @@
+"""Shared client session for LetMeKnow clients."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import BaseConnector, ClientSession, TCPConnector, UnixConnector
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+@dataclass
+class LMKSessionManager:
+    """Reference counted session shared by clients not given their own.
+
+    Each event loop gets its own session per transport, created by the first
+    client to acquire it and closed when the last client releases it.
+    """
+
+    # Websockets keep their connections open, so a limit on connections
+    # would stop new clients from connecting, 0 for no limit
+    limit: int = 0
+    limit_per_host: int = 0
+    # Seconds to cache resolved hosts for, so reconnects skip DNS lookups
+    ttl_dns_cache: int = 300
+
+    _sessions: dict[
+        tuple[asyncio.AbstractEventLoop, str | None], tuple[ClientSession, int]
+    ] = field(default_factory=dict, repr=False)
+
+    def _create_connector(self, socket_path: str | None) -> BaseConnector:
+        """Create the connector for a new session.
+
+        Args:
+        ----
+            socket_path: Unix socket to connect to, or None for TCP.
+
+        Returns:
+        -------
+            The connector.
+
+        """
+        if socket_path is not None:
+            return UnixConnector(
+                path=socket_path,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+            )
+
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+    def acquire(self, socket_path: str | None = None) -> ClientSession:
+        """Get the session of the running event loop.
+
+        Each acquire must be paired with a release.
+
+        Args:
+        ----
+            socket_path: Unix socket to connect to, or None for TCP.
+
+        Returns:
+        -------
+            The shared session.
+
+        """
+        key = (asyncio.get_running_loop(), socket_path)
+
+        if (entry := self._sessions.get(key)) is not None and not entry[0].closed:
+            session, references = entry
+        else:
+            LOGGER.debug("Creating shared client session for %s", socket_path or "TCP")
+            session = ClientSession(connector=self._create_connector(socket_path))
+            references = 0
+
+        self._sessions[key] = (session, references + 1)
+        return session
+
+    async def release(
+        self,
+        session: ClientSession,
+        socket_path: str | None = None,
+    ) -> None:
+        """Release an acquired session, closing it if no longer used.
+
+        Args:
+        ----
+            session: Session to release.
+            socket_path: Unix socket the session was acquired for.
+
+        """
+        key = (asyncio.get_running_loop(), socket_path)
+
+        if (entry := self._sessions.get(key)) is None or entry[0] is not session:
+            # Not the current session of this loop, e.g. closed by the caller
+            if not session.closed:
+                await session.close()
+            return
+
+        if (references := entry[1] - 1) > 0:
+            self._sessions[key] = (session, references)
+            return
+
+        LOGGER.debug("Closing shared client session for %s", socket_path or "TCP")
+        del self._sessions[key]
+        await session.close()
+
+    @contextlib.asynccontextmanager
+    async def session(
+        self,
+        socket_path: str | None = None,
+    ) -> AsyncIterator[ClientSession]:
+        """Acquire the shared session for the duration of a block.
+
+        Args:
+        ----
+            socket_path: Unix socket to connect to, or None for TCP.
+
+        Returns:
+        -------
+            An async context manager for the shared session.
+
+        """
+        session = self.acquire(socket_path)
+        try:
+            yield session
+        finally:
+            await self.release(session, socket_path)
+
+    @property
+    def sessions(self) -> int:
+        """Number of open shared sessions.
+
+        Returns
+        -------
+            The number of shared sessions, over all event loops.
+
+        """
+        return len(self._sessions)
+
+
+SESSION_MANAGER: Final[LMKSessionManager] = LMKSessionManager()
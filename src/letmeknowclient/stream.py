@@ -0,0 +1,221 @@
+"""Notification stream for LetMeKnow."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import contextlib
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from typing_extensions import Self
+
+    from .models import LMKNotification
+
+
+class LMKOverflowPolicy(StrEnum):
+    """Enum of what to do when a notification stream is full."""
+
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+
+
+class LMKNotificationStream:
+    """Bounded async iterator of received notifications.
+
+    Notifications are buffered between the websocket reader and the consumer,
+    so a slow consumer does not stall reading from the socket unless the
+    overflow policy is BLOCK. Several consumers can iterate the same stream,
+    each notification going to one of them.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        overflow: LMKOverflowPolicy = LMKOverflowPolicy.BLOCK,
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+        ----
+            maxsize: Maximum number of buffered notifications, 0 for no limit.
+            overflow: What to do with a notification when the buffer is full.
+            on_close: Callback to call when the stream is closed.
+
+        """
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._items: deque[LMKNotification] = deque()
+        self._getters: deque[asyncio.Future[None]] = deque()
+        self._putter: asyncio.Future[None] | None = None
+        self._closed = False
+        self._on_close = on_close
+
+    def __aiter__(self) -> Self:
+        """Async iterator.
+
+        Returns
+        -------
+            The LMKNotificationStream object.
+
+        """
+        return self
+
+    async def __anext__(self) -> LMKNotification:
+        """Get the next notification.
+
+        Returns
+        -------
+            The next notification.
+
+        """
+        while not self._items:
+            if self._closed:
+                raise StopAsyncIteration
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except asyncio.CancelledError:
+                with contextlib.suppress(ValueError):
+                    self._getters.remove(getter)
+                # Pass on a wake up this consumer will not use
+                if self._items:
+                    self._wake_getter()
+                raise
+
+        notification = self._items.popleft()
+        self._wake(self._putter)
+        return notification
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The LMKNotificationStream object.
+
+        """
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """Check if the stream is closed."""
+        return self._closed
+
+    def qsize(self) -> int:
+        """Get the number of buffered notifications."""
+        return len(self._items)
+
+    def drain(self, limit: int | None = None) -> list[LMKNotification]:
+        """Get the buffered notifications without waiting.
+
+        Args:
+        ----
+            limit: Maximum number of notifications to get.
+
+        Returns:
+        -------
+            The buffered notifications, oldest first.
+
+        """
+        if limit is None or limit >= len(self._items):
+            notifications = list(self._items)
+            self._items.clear()
+        else:
+            notifications = [self._items.popleft() for _ in range(limit)]
+
+        if notifications:
+            self._wake(self._putter)
+        return notifications
+
+    def close(self) -> None:
+        """Close the stream.
+
+        Buffered notifications can still be read before iteration stops.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        while self._getters:
+            self._wake(self._getters.popleft())
+        self._wake(self._putter)
+
+        if self._on_close is not None:
+            self._on_close()
+
+    def put(self, notification: LMKNotification) -> Awaitable[None] | None:
+        """Add a notification to the stream.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        Returns:
+        -------
+            An awaitable to wait on when the stream is full and blocking.
+
+        """
+        if self._closed:
+            return None
+
+        if self.maxsize > 0 and len(self._items) >= self.maxsize:
+            if self.overflow == LMKOverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return None
+
+            if self.overflow == LMKOverflowPolicy.DROP_OLDEST:
+                self._items.popleft()
+                self.dropped += 1
+            else:
+                return self._put_blocking(notification)
+
+        self._items.append(notification)
+        self._wake_getter()
+        return None
+
+    async def _put_blocking(self, notification: LMKNotification) -> None:
+        """Add a notification once there is room in the stream.
+
+        Args:
+        ----
+            notification: Notification received.
+
+        """
+        while len(self._items) >= self.maxsize and not self._closed:
+            self._putter = asyncio.get_running_loop().create_future()
+            await self._putter
+
+        if not self._closed:
+            self._items.append(notification)
+            self._wake_getter()
+
+    def _wake_getter(self) -> None:
+        """Wake the longest waiting consumer."""
+        while self._getters:
+            if not (getter := self._getters.popleft()).done():
+                getter.set_result(None)
+                return
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future[None] | None) -> None:
+        """Wake a waiting getter or putter."""
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
@@ -2,13 +2,62 @@
 
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
+from .exceptions import LMKError
+from .models import LMKWSResponseType
+
 if TYPE_CHECKING:
+    from .lmk import LMKClient
     from .models import LMKClientType
 
 
 def generate_user_id(client_type: LMKClientType) -> str:
     """Generate a user ID."""
     return f"{client_type}-{uuid4()!s}"
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Get a nearest rank percentile of values.
+
+    Args:
+    ----
+        values: Values to get the percentile of.
+        percent: Percentile to get, from 0 to 100.
+
+    Returns:
+    -------
+        The percentile, or 0 if there are no values.
+
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = math.ceil(percent / 100 * len(values)) - 1
+    return values[min(max(index, 0), len(values) - 1)]
+
+
+async def connect_client(client: LMKClient) -> LMKClient:
+    """Connect and register a client, closing it if registering fails.
+
+    Args:
+    ----
+        client: Client to connect.
+
+    Returns:
+    -------
+        The registered client.
+
+    """
+    await client.connect()
+
+    if (
+        register_response := await client.ws_wait_registered()
+    ).type != LMKWSResponseType.REGISTER:
+        await client.ws_close()
+        msg = f"Failed to register with websocket server: {register_response}"
+        raise LMKError(msg)
+
+    return client
@@ -0,0 +1,129 @@
+"""Fixtures for LetMeKnow tests."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from pathlib import Path
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from letmeknowclient import (
+    LMKClient,
+    LMKClientType,
+    LMKWSRequestType,
+    LMKWSResponseType,
+    generate_user_id,
+)
+from letmeknowclient.server import LMKTestServer
+from letmeknowclient.utils import connect_client
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[LMKTestServer]:
+    """Stand-in LetMeKnow server on a free port."""
+    async with LMKTestServer() as server:
+        yield server
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    """Path for a Unix socket, short enough for the limit on its length."""
+    with tempfile.TemporaryDirectory() as directory:
+        yield str(Path(directory, "lmk.sock"))
+
+
+@pytest.fixture
+async def unix_server(socket_path: str) -> AsyncIterator[LMKTestServer]:
+    """Stand-in LetMeKnow server also listening on a Unix socket."""
+    async with LMKTestServer(path=socket_path) as server:
+        yield server
+
+
+@pytest.fixture
+async def echo_port() -> AsyncIterator[int]:
+    """Port of a server replying with the title of each notification.
+
+    Register requests are accepted. The reply to "slow" is delayed, and
+    "close" closes the connection without a reply.
+    """
+
+    async def _handle(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            data = json.loads(message.data)
+            if data["type"] == LMKWSRequestType.REGISTER:
+                response_type = LMKWSResponseType.REGISTER
+                title = data["userID"]
+            else:
+                response_type = LMKWSResponseType.NOTIFICATION_SENT
+                title = (data.get("data") or {}).get("title")
+            if title == "close":
+                await ws.close()
+                break
+            if title == "slow":
+                await asyncio.sleep(0.3)
+            await ws.send_json(
+                {"type": response_type, "succeeded": True, "message": title}
+            )
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/websocket", _handle)
+    async with TestServer(app, host="127.0.0.1") as server:
+        assert server.port is not None
+        yield server.port
+
+
+@pytest.fixture
+async def reject_port() -> AsyncIterator[int]:
+    """Port of a server answering every request with an error."""
+
+    async def _handle(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for _message in ws:
+            await ws.send_json(
+                {"type": LMKWSResponseType.ERROR, "message": "No", "error": "No"}
+            )
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/websocket", _handle)
+    async with TestServer(app, host="127.0.0.1") as server:
+        assert server.port is not None
+        yield server.port
+
+
+@pytest.fixture
+async def connected(
+    server: LMKTestServer,
+) -> AsyncIterator[Callable[..., Awaitable[LMKClient]]]:
+    """Create registered clients, closed after the test."""
+    async with contextlib.AsyncExitStack() as stack:
+
+        async def _connected(
+            client_type: LMKClientType = LMKClientType.CLIENT,
+            **kwargs: Any,
+        ) -> LMKClient:
+            client = LMKClient(
+                server.host,
+                server.port,
+                client_type,
+                generate_user_id(client_type),
+                **kwargs,
+            )
+            return await connect_client(await stack.enter_async_context(client))
+
+        yield _connected
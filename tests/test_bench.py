@@ -0,0 +1,185 @@
+"""Tests for the LetMeKnow load generator."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from typing import TYPE_CHECKING
+
+import pytest
+
+from letmeknowclient import (
+    TARGETS_ALL_HEADLESS,
+    LMKClient,
+    LMKClientType,
+    LMKNotification,
+    generate_user_id,
+)
+from letmeknowclient.__main__ import main
+from letmeknowclient.bench import LMKBenchConfig, LMKBenchResult, _send, run_bench
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from letmeknowclient.server import LMKTestServer
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+
+@pytest.fixture
+def free_port() -> int:
+    """Port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+    return port
+
+
+# Sending at a million a second falls behind the rate
+@pytest.mark.parametrize("rate", [0.0, 200.0, 1e6])
+async def test_run_bench(server: LMKTestServer, rate: float) -> None:
+    """Test every notification sent is delivered to every listener."""
+    result = await run_bench(
+        LMKBenchConfig(
+            host=server.host,
+            port=server.port,
+            senders=2,
+            listeners=2,
+            rate=rate,
+            duration=0.2,
+        )
+    )
+
+    assert result.sent > 0
+    assert result.errors == 0
+    assert result.delivered == result.sent * 2
+    assert len(result.latencies) == result.delivered
+    assert 0 < result.percentile(50) <= result.percentile(100)
+    assert result.throughput == result.sent / result.duration
+    if rate:
+        assert result.sent <= rate * result.duration + 2
+
+
+async def test_run_bench_reconnects(
+    server: LMKTestServer,
+    connected: Connected,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the clients reconnect and other notifications are not counted."""
+    monkeypatch.setattr("letmeknowclient.lmk.random.uniform", lambda _a, _b: 0.05)
+    config = LMKBenchConfig(
+        host=server.host,
+        port=server.port,
+        duration=1.0,
+        drain_timeout=0.2,
+    )
+    bench = asyncio.create_task(run_bench(config))
+
+    await asyncio.sleep(0.2)
+    await server.stop()
+    await asyncio.sleep(0.2)
+    await server.start()
+    await asyncio.sleep(0.2)
+    client = await connected()
+    await client.ws_send_notification(
+        LMKNotification(title="Other"), TARGETS_ALL_HEADLESS
+    )
+    result = await bench
+
+    assert result.reconnects == 2
+    assert result.sent > 0
+    assert result.delivered <= result.sent
+
+
+async def test_run_bench_waits_for_deliveries(echo_port: int) -> None:
+    """Test the deliveries missing at the end are waited for, up to a timeout."""
+    # The server replies to each send without forwarding it
+    result = await run_bench(
+        LMKBenchConfig(
+            host="127.0.0.1",
+            port=echo_port,
+            duration=0.1,
+            drain_timeout=0.1,
+        )
+    )
+
+    assert result.sent > 0
+    assert result.delivered == 0
+
+
+async def test_send_counts_errors(reject_port: int, echo_port: int) -> None:
+    """Test failed sends and error responses are counted as errors."""
+    result = LMKBenchResult()
+    async with LMKClient(
+        "127.0.0.1",
+        reject_port,
+        LMKClientType.CLIENT,
+        generate_user_id(LMKClientType.CLIENT),
+    ) as client:
+        await client.ws_connect()
+        await _send(client, [], result)
+    async with LMKClient(
+        "127.0.0.1",
+        echo_port,
+        LMKClientType.CLIENT,
+        generate_user_id(LMKClientType.CLIENT),
+    ) as client:
+        await _send(client, [], result)
+
+    assert result.errors == 2
+    assert result.sent == 0
+
+
+def test_empty_result() -> None:
+    """Test a result without sends has no throughput or latency."""
+    result = LMKBenchResult()
+
+    assert result.throughput == 0
+    assert result.percentile(99) == 0
+
+
+def test_main_bench_local(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the bench command against a stand-in server."""
+    assert main(["bench", "--local", "--duration", "0.1", "--rate", "100"]) == 0
+
+    output = capsys.readouterr().out
+    assert "rate        100/s for 0.1s" in output
+    assert "errors      0" in output
+
+
+def test_main_bench_connection_error(
+    free_port: int,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test a server that cannot be reached is reported without a traceback."""
+    assert main(["bench", "--host", "127.0.0.1", "--port", str(free_port)]) == 1
+
+    error = capsys.readouterr().err
+    assert error.startswith("Error: Error connecting to WebSocket: Cannot connect")
+
+
+async def test_main_bench_register_error(
+    reject_port: int,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test a failed register is reported without a traceback."""
+    # Run in a thread, so the server keeps running on the loop of the test
+    args = ["bench", "--host", "127.0.0.1", "--port", str(reject_port)]
+    assert await asyncio.to_thread(main, args) == 1
+
+    error = capsys.readouterr().err
+    assert error.startswith("Error: Failed to register with websocket server")
+
+
+def test_main_bench_unix_socket(
+    socket_path: str,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test the bench command over the Unix socket of a stand-in server."""
+    args = ["bench", "--local", "--socket-path", socket_path, "--duration", "0.1"]
+
+    assert main(args) == 0
+
+    output = capsys.readouterr().out
+    assert f"target      {socket_path}" in output
+    assert "errors      0" in output
@@ -0,0 +1,119 @@
+"""Tests for the LetMeKnow JSON codecs."""
+
+from __future__ import annotations
+
+from importlib.util import find_spec
+import json
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from letmeknowclient import (
+    LMKClientConfig,
+    LMKClientType,
+    LMKError,
+    LMKJSONCodec,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSResponseType,
+    get_json_codec,
+)
+from letmeknowclient.codec import CODEC_JSON, CODEC_MSGSPEC, CODEC_ORJSON, CODECS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from letmeknowclient import LMKClient
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+FRAME = {"type": "notification", "data": {"title": "Café", "timeout": 5}}
+
+
+@pytest.mark.parametrize("name", CODECS)
+def test_codec_round_trip(name: str) -> None:
+    """Test each codec decodes what it encodes, from str and bytes."""
+    if name != CODEC_JSON:
+        pytest.importorskip(name)
+    codec = get_json_codec(name)
+
+    encoded = codec.dumps(FRAME)
+
+    assert isinstance(encoded, str)
+    assert codec.loads(encoded) == FRAME
+    assert codec.loads(encoded.encode()) == FRAME
+    with pytest.raises(codec.decode_errors):
+        codec.loads("{")
+
+
+def test_default_codec_is_fastest_installed() -> None:
+    """Test the default codec is the first installed one."""
+    installed = [name for name in CODECS if name == CODEC_JSON or find_spec(name)]
+
+    assert get_json_codec().name == installed[0]
+
+
+def test_unknown_codec() -> None:
+    """Test an unknown codec is rejected."""
+    with pytest.raises(LMKError, match="Unknown JSON codec"):
+        get_json_codec("yaml")
+
+
+@pytest.mark.parametrize("name", [CODEC_ORJSON, CODEC_MSGSPEC])
+def test_codec_not_installed(name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test asking for a codec whose library is missing fails."""
+    monkeypatch.setitem(sys.modules, name, None)
+
+    with pytest.raises(LMKError, match="not installed"):
+        # Skip the cache, which may hold the codec loaded before
+        get_json_codec.__wrapped__(name)
+
+
+@pytest.mark.parametrize("name", CODECS)
+async def test_client_codec_round_trip(connected: Connected, name: str) -> None:
+    """Test notifications sent and received with each codec arrive unchanged."""
+    if name != CODEC_JSON:
+        pytest.importorskip(name)
+    config = LMKClientConfig(json_codec=get_json_codec(name))
+    listener = await connected(LMKClientType.HEADLESS, config=config)
+    sender = await connected(config=config)
+    stream = listener.notifications()
+    notification = LMKNotification(
+        type="status",
+        title='Café "open"',
+        content="Line\nbreak",
+        image=LMKNotificationImage(url="https://example.com/a.png"),
+        timeout=5000,
+    )
+
+    await sender.ws_send_notification(notification, [listener.lmk_user_id])
+
+    assert await anext(stream) == notification
+
+
+@pytest.mark.parametrize("decodes_bytes", [False, True])
+async def test_client_decodes_frames_from_bytes(
+    connected: Connected,
+    decodes_bytes: bool,  # noqa: FBT001
+) -> None:
+    """Test a codec decoding bytes is given the frames without a str decode."""
+    frames: list[str | bytes] = []
+
+    def _loads(data: str | bytes) -> object:
+        frames.append(data)
+        return json.loads(data)
+
+    codec = LMKJSONCodec(
+        name="recording",
+        dumps=json.dumps,
+        loads=_loads,
+        decodes_bytes=decodes_bytes,
+    )
+    client = await connected(config=LMKClientConfig(json_codec=codec))
+
+    response = await client.ws_send_notification(LMKNotification(title="Bytes"))
+
+    assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+    assert frames
+    assert all(isinstance(frame, bytes if decodes_bytes else str) for frame in frames)
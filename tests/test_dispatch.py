@@ -0,0 +1,279 @@
+"""Tests for the notification dispatchers."""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING
+
+from letmeknowclient import (
+    LMKCallbackDispatcher,
+    LMKClientType,
+    LMKNotification,
+    LMKNotificationDispatcher,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    import pytest
+
+    from letmeknowclient import LMKClient
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+
+async def test_callback_backpressure() -> None:
+    """Test dispatching waits for a free slot at the concurrency limit."""
+    release = asyncio.Event()
+    received: list[LMKNotification] = []
+
+    async def _callback(notification: LMKNotification) -> None:
+        await release.wait()
+        received.append(notification)
+
+    dispatcher = LMKCallbackDispatcher(_callback, max_concurrency=1)
+
+    assert dispatcher(LMKNotification(title="First")) is None
+    waiting = dispatcher(LMKNotification(title="Second"))
+    assert waiting is not None
+    wait = asyncio.ensure_future(waiting)
+    await asyncio.sleep(0.01)
+    assert not wait.done()
+
+    release.set()
+    await wait
+    await dispatcher.close()
+
+    assert [notification.title for notification in received] == ["First", "Second"]
+
+
+async def test_callback_error_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test an error in a callback is logged instead of raised."""
+
+    async def _callback(_notification: LMKNotification) -> None:
+        raise ValueError
+
+    dispatcher = LMKCallbackDispatcher(_callback)
+
+    dispatcher(LMKNotification())
+    await dispatcher.close()
+
+    assert "Error in notification listener" in caplog.text
+
+
+async def test_sync_callback_result_is_awaited() -> None:
+    """Test an awaitable returned by a synchronous callback is awaited."""
+    received: list[LMKNotification] = []
+
+    async def _record(notification: LMKNotification) -> None:
+        received.append(notification)
+
+    def _callback(notification: LMKNotification) -> asyncio.Future[None] | None:
+        if notification.title is None:
+            return None
+        return asyncio.ensure_future(_record(notification))
+
+    dispatcher = LMKCallbackDispatcher(_callback)
+
+    dispatcher(LMKNotification())
+    dispatcher(LMKNotification(title="Awaited"))
+    await dispatcher.close()
+
+    assert [notification.title for notification in received] == ["Awaited"]
+
+
+async def test_close_waits_for_ordered_callbacks() -> None:
+    """Test closing runs the ordered callbacks still queued."""
+    received: list[str | None] = []
+
+    async def _callback(notification: LMKNotification) -> None:
+        await asyncio.sleep(0)
+        received.append(notification.title)
+
+    dispatcher = LMKCallbackDispatcher(_callback, ordered=True)
+    for index in range(3):
+        assert dispatcher(LMKNotification(title=str(index))) is None
+    await dispatcher.close()
+
+    assert received == ["0", "1", "2"]
+
+
+async def test_close_cancels_ordered_callbacks() -> None:
+    """Test closing with cancel stops the ordered worker and its callback."""
+    started = asyncio.Event()
+
+    async def _callback(_notification: LMKNotification) -> None:
+        started.set()
+        await asyncio.Event().wait()
+
+    dispatcher = LMKCallbackDispatcher(_callback, ordered=True)
+    dispatcher(LMKNotification())
+    await started.wait()
+
+    async with asyncio.timeout(5):
+        await dispatcher.close(cancel=True)
+
+
+def _record_title(titles: list[str | None], notification: LMKNotification) -> None:
+    """Record the title of a notification."""
+    titles.append(notification.title)
+
+
+async def test_routes_by_type() -> None:
+    """Test handlers only receive their type, and wildcards receive all."""
+    dispatcher = LMKNotificationDispatcher()
+    received: dict[str, list[str | None]] = {"alert": [], "status": [], "*": []}
+    for key, handled in received.items():
+        dispatcher.subscribe(partial(_record_title, handled), key)
+
+    for notification_type in ("alert", "status", "other"):
+        assert (
+            dispatcher(LMKNotification(type=notification_type, title=notification_type))
+            is None
+        )
+
+    assert received == {
+        "alert": ["alert"],
+        "status": ["status"],
+        "*": ["alert", "status", "other"],
+    }
+
+
+async def test_unsubscribe() -> None:
+    """Test an unsubscribed handler is no longer called."""
+    dispatcher = LMKNotificationDispatcher()
+    received: list[LMKNotification] = []
+    unsubscribe = dispatcher.subscribe(received.append, "alert")
+
+    dispatcher(LMKNotification(type="alert"))
+    unsubscribe()
+    dispatcher(LMKNotification(type="alert"))
+    # Unsubscribing again, or a handler never subscribed, does nothing
+    unsubscribe()
+    dispatcher.unsubscribe(received.append)
+
+    assert len(received) == 1
+
+
+async def test_unsubscribe_coroutine_handler() -> None:
+    """Test a coroutine handler subscribed twice is removed one at a time."""
+    dispatcher = LMKNotificationDispatcher()
+    received: list[LMKNotification] = []
+
+    async def _handler(notification: LMKNotification) -> None:
+        received.append(notification)
+
+    dispatcher.subscribe(_handler, "alert")
+    dispatcher.subscribe(_handler, "alert")
+    dispatcher.subscribe(_handler, "status")
+    dispatcher(LMKNotification(type="alert"))
+
+    dispatcher.unsubscribe(_handler, "alert")
+    dispatcher(LMKNotification(type="alert"))
+    dispatcher.unsubscribe(_handler, "alert")
+    dispatcher(LMKNotification(type="alert"))
+    await dispatcher.close()
+
+    assert len(received) == 3
+
+
+async def test_handler_error_does_not_stop_others(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing handler does not keep the others from running."""
+    dispatcher = LMKNotificationDispatcher()
+    received: list[LMKNotification] = []
+
+    def _fail(_notification: LMKNotification) -> None:
+        raise RuntimeError
+
+    dispatcher.subscribe(_fail)
+    dispatcher.subscribe(received.append)
+    dispatcher(LMKNotification(type="alert"))
+
+    assert len(received) == 1
+    assert "Error in notification handler" in caplog.text
+
+
+async def test_failed_awaitable_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test an awaitable returned by a handler that fails is logged."""
+    dispatcher = LMKNotificationDispatcher()
+
+    def _fail(_notification: LMKNotification) -> asyncio.Future[None]:
+        future = asyncio.get_running_loop().create_future()
+        future.set_exception(RuntimeError())
+        return future
+
+    dispatcher.subscribe(_fail)
+    waiting = dispatcher(LMKNotification(type="alert"))
+    assert waiting is not None
+    await waiting
+
+    assert "Error in notification handler" in caplog.text
+
+
+async def test_coroutine_handler_runs_off_the_caller() -> None:
+    """Test a slow coroutine handler does not hold up dispatching."""
+    dispatcher = LMKNotificationDispatcher()
+    release = asyncio.Event()
+    handled: list[str | None] = []
+
+    async def _slow(notification: LMKNotification) -> None:
+        await release.wait()
+        handled.append(notification.title)
+
+    dispatcher.subscribe(_slow, "alert")
+    for index in range(3):
+        assert dispatcher(LMKNotification(type="alert", title=str(index))) is None
+    assert handled == []
+
+    release.set()
+    await dispatcher.close()
+    assert set(handled) == {"0", "1", "2"}
+
+
+async def test_coroutine_handler_backpressure() -> None:
+    """Test dispatching waits once a coroutine handler is at its limit."""
+    dispatcher = LMKNotificationDispatcher(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def _slow(_notification: LMKNotification) -> None:
+        await release.wait()
+
+    dispatcher.subscribe(_slow)
+    assert dispatcher(LMKNotification(type="alert")) is None
+    waiting = dispatcher(LMKNotification(type="alert"))
+    assert waiting is not None
+
+    release.set()
+    await waiting
+    await dispatcher.close()
+
+
+async def test_dispatch_from_client(connected: Connected) -> None:
+    """Test a dispatcher listening on a client receives sent notifications."""
+    listener = await connected(LMKClientType.HEADLESS)
+    sender = await connected()
+    dispatcher = LMKNotificationDispatcher()
+    received = asyncio.Queue[LMKNotification]()
+
+    async def _alert(notification: LMKNotification) -> None:
+        await received.put(notification)
+
+    dispatcher.subscribe(_alert, "alert")
+    listen = asyncio.create_task(listener.ws_listen_for_notifications(dispatcher))
+    await asyncio.sleep(0)
+
+    for notification_type in ("status", "alert"):
+        await sender.ws_send_notification(
+            LMKNotification(type=notification_type), [listener.lmk_user_id]
+        )
+
+    async with asyncio.timeout(5):
+        assert (await received.get()).type == "alert"
+
+    await listener.ws_close()
+    await listen
+    await dispatcher.close()
+    assert received.empty()
@@ -0,0 +1,161 @@
+"""Tests for the LetMeKnow fleet simulator."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+import logging
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from letmeknowclient import LMKConnectionError, LMKNotification
+from letmeknowclient.__main__ import main
+from letmeknowclient.fleet import (
+    FLEET_NOTIFICATION_TYPE,
+    LMKFleetBroadcast,
+    LMKFleetConfig,
+    LMKFleetResult,
+    _Deliveries,
+    run_fleet,
+)
+from letmeknowclient.utils import connect_client
+
+if TYPE_CHECKING:
+    from letmeknowclient import LMKClient
+    from letmeknowclient.server import LMKTestServer
+
+
+def _config(server: LMKTestServer, **changes: Any) -> LMKFleetConfig:
+    """Create a small fleet configuration for the server."""
+    config = LMKFleetConfig(
+        host=server.host,
+        port=server.port,
+        clients=20,
+        ramp_concurrency=5,
+        broadcasts=2,
+        broadcast_interval=0.01,
+        broadcast_timeout=5.0,
+    )
+    return replace(config, **changes)
+
+
+async def test_run_fleet(server: LMKTestServer) -> None:
+    """Test every broadcast reaches every listener of the fleet."""
+    result = await run_fleet(_config(server))
+
+    assert result.connected == 20
+    assert result.failed == 0
+    assert result.disconnected == 0
+    assert result.connection_rate > 0
+    assert result.memory_per_connection is not None
+    assert result.memory_per_connection > 0
+    assert not tracemalloc.is_tracing()
+    assert len(result.broadcasts) == 2
+    for broadcast in result.broadcasts:
+        assert broadcast.delivered == broadcast.expected == 20
+        assert broadcast.completion is not None
+        assert broadcast.percentile(100) == broadcast.completion
+    assert not server.clients
+
+
+async def test_run_fleet_without_memory(server: LMKTestServer) -> None:
+    """Test memory is not traced when turned off."""
+    result = await run_fleet(_config(server, trace_memory=False, broadcasts=1))
+
+    assert result.memory is None
+    assert result.memory_per_connection is None
+
+
+async def test_run_fleet_keeps_tracing(server: LMKTestServer) -> None:
+    """Test memory tracing started before the fleet is left running."""
+    tracemalloc.start()
+    try:
+        result = await run_fleet(_config(server, broadcasts=1))
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    assert result.memory is not None
+
+
+async def test_run_fleet_counts_failed_listeners(
+    server: LMKTestServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test listeners failing to connect are counted, and not broadcast to."""
+    failures = 20
+
+    async def _connect_client(client: LMKClient) -> LMKClient:
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise LMKConnectionError
+        return await connect_client(client)
+
+    monkeypatch.setattr("letmeknowclient.fleet.connect_client", _connect_client)
+
+    result = await run_fleet(_config(server))
+
+    assert result.connected == 0
+    assert result.failed == 20
+    assert result.connection_rate == 0
+    assert result.memory_per_connection is None
+    assert result.broadcasts == [LMKFleetBroadcast(expected=0)]
+
+
+async def test_run_fleet_broadcast_timeout(
+    server: LMKTestServer,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a broadcast not reaching every listener in time is reported."""
+    caplog.set_level(logging.WARNING)
+    # Lose every delivery
+    monkeypatch.setattr(_Deliveries, "received", lambda _self, _notification: None)
+
+    result = await run_fleet(_config(server, broadcasts=1, broadcast_timeout=0.01))
+
+    assert result.broadcasts[0].completion is None
+    assert "Broadcast 0 reached" in caplog.text
+
+
+def test_deliveries_skip_other_notifications() -> None:
+    """Test notifications other than the broadcasts are not counted."""
+    deliveries = _Deliveries()
+    broadcast = LMKFleetBroadcast(expected=2)
+    deliveries.broadcasts["sender-0"] = (0.0, broadcast)
+
+    deliveries.received(LMKNotification(title="sender-0"))
+    deliveries.received(LMKNotification(type=FLEET_NOTIFICATION_TYPE, title="other"))
+    deliveries.received(LMKNotification(type=FLEET_NOTIFICATION_TYPE))
+    assert broadcast.delivered == 0
+
+    deliveries.received(LMKNotification(type=FLEET_NOTIFICATION_TYPE, title="sender-0"))
+    assert broadcast.delivered == 1
+    assert not deliveries.delivered.is_set()
+
+
+def test_empty_result() -> None:
+    """Test a result without connections has no rate or memory."""
+    result = LMKFleetResult(memory=1024)
+
+    assert result.connection_rate == 0
+    assert result.memory_per_connection is None
+
+
+@pytest.mark.parametrize("trace_memory", [[], ["--no-trace-memory"]])
+def test_main_fleet_local(
+    capsys: pytest.CaptureFixture[str],
+    trace_memory: list[str],
+) -> None:
+    """Test the fleet command against a stand-in server."""
+    args = ["fleet", "--local", "--clients", "10", "--broadcasts", "1"]
+
+    assert main([*args, *trace_memory]) == 0
+
+    output = capsys.readouterr().out
+    assert "connected   10 of 10" in output
+    assert "broadcast 0 10 of 10" in output
+    assert ("memory" in output) == (not trace_memory)
@@ -0,0 +1,900 @@
+"""Tests for the LetMeKnow client."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientConnectionError, WSMessage, WSMsgType, web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from letmeknowclient import (
+    LMKClient,
+    LMKClientConfig,
+    LMKClientType,
+    LMKConnectionError,
+    LMKNotConnectedError,
+    LMKNotification,
+    LMKWSResponseError,
+    LMKWSResponseType,
+    generate_user_id,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from letmeknowclient.server import LMKTestServer
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+
+@pytest.fixture
+async def frames_port() -> AsyncIterator[int]:
+    """Port of a server replying with the frames listed in each request.
+
+    The content of a notification is a JSON list of frames to send back, each
+    a text, binary or close frame.
+    """
+
+    async def _handle(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            for frame in json.loads(json.loads(message.data)["data"]["content"]):
+                if "text" in frame:
+                    await ws.send_str(frame["text"])
+                elif "binary" in frame:
+                    await ws.send_bytes(frame["binary"].encode())
+                else:
+                    await ws.close(code=frame["close"], message=b"Bye")
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/websocket", _handle)
+    async with TestServer(app, host="127.0.0.1") as server:
+        assert server.port is not None
+        yield server.port
+
+
+def _frames(*frames: dict[str, object]) -> LMKNotification:
+    """Create a request for the frames server to reply to with frames."""
+    return LMKNotification(content=json.dumps(frames))
+
+
+def _response(message: str) -> dict[str, object]:
+    """Create a text frame holding a successful response."""
+    return {
+        "text": json.dumps(
+            {
+                "type": LMKWSResponseType.NOTIFICATION_SENT,
+                "succeeded": True,
+                "message": message,
+            }
+        )
+    }
+
+
+def _echo_client(port: int, **kwargs: object) -> LMKClient:
+    """Create a client for the echo server."""
+    return LMKClient(
+        "127.0.0.1",
+        port,
+        LMKClientType.CLIENT,
+        generate_user_id(LMKClientType.CLIENT),
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+async def test_concurrent_sends_get_their_own_response(echo_port: int) -> None:
+    """Test concurrent sends on one connection each get their own response."""
+    async with _echo_client(echo_port) as client:
+        await client.ws_connect()
+
+        responses = await asyncio.gather(
+            *(
+                client.ws_send_notification(LMKNotification(title=str(index)))
+                for index in range(50)
+            )
+        )
+
+        assert [response.message for response in responses] == [
+            str(index) for index in range(50)
+        ]
+        assert client.ws_pending == 0
+
+
+async def test_register(connected: Connected) -> None:
+    """Test registering again on an open connection."""
+    client = await connected()
+
+    response = await client.ws_register()
+
+    assert response.type == LMKWSResponseType.REGISTER
+
+
+async def test_timed_out_response_stays_aligned(echo_port: int) -> None:
+    """Test a late response is dropped instead of answering the next request."""
+    async with _echo_client(echo_port, request_timeout=0.1) as client:
+        await client.ws_connect()
+
+        with pytest.raises(TimeoutError):
+            await client.ws_send_notification(LMKNotification(title="slow"))
+        client.request_timeout = 1
+        response = await client.ws_send_notification(LMKNotification(title="next"))
+
+        assert response.message == "next"
+        assert client.ws_pending == 0
+
+
+async def test_send_without_response_stays_aligned(echo_port: int) -> None:
+    """Test the reply to a send not waiting for one is not taken by the next."""
+    async with _echo_client(echo_port) as client:
+        await client.ws_connect()
+
+        response = await client._ws_send(  # noqa: SLF001
+            LMKNotification(title="first").to_dict(), wait_for_response=False
+        )
+        assert response.type == LMKWSResponseType.SUCCESS
+        response = await client.ws_send_notification(LMKNotification(title="second"))
+
+        assert response.message == "second"
+
+
+async def test_pending_request_fails_on_close(echo_port: int) -> None:
+    """Test a request in flight is answered with an error when the connection closes."""
+    async with _echo_client(echo_port) as client:
+        await client.ws_connect()
+
+        response = await client.ws_send_notification(LMKNotification(title="close"))
+
+        assert response.type == LMKWSResponseType.ERROR
+        assert response.message == "Connection closed"
+        assert client.ws_close_reason is not None
+        assert not client.ws_connected
+
+
+async def test_send_after_close_fails(connected: Connected) -> None:
+    """Test sending on a closed connection fails without queueing a request."""
+    client = await connected()
+    await client.ws_close()
+
+    with pytest.raises(LMKNotConnectedError):
+        await client.ws_send_notification(LMKNotification(title="Late"))
+    assert client.ws_pending == 0
+
+
+async def test_send_closed_while_waiting_for_lock(connected: Connected) -> None:
+    """Test a send waiting on another one fails if the connection closes."""
+    client = await connected()
+
+    async with client._send_lock:  # noqa: SLF001
+        send = asyncio.create_task(
+            client.ws_send_notification(LMKNotification(title="Late"))
+        )
+        await asyncio.sleep(0)
+        await client.ws_close()
+
+    with pytest.raises(LMKNotConnectedError):
+        await send
+    assert client.ws_pending == 0
+
+
+async def test_failed_write_is_not_queued(
+    connected: Connected,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a request whose frame could not be written is not left pending."""
+    client = await connected()
+
+    async def _send_str(_data: str) -> None:
+        raise ClientConnectionError
+
+    monkeypatch.setattr(client._ws, "send_str", _send_str)  # noqa: SLF001
+
+    with pytest.raises(LMKConnectionError):
+        await client.ws_send_notification(LMKNotification(title="Lost"))
+    assert client.ws_pending == 0
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Wait until a condition is met."""
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def test_listen_while_sending(connected: Connected) -> None:
+    """Test notifications and responses are read from the same connection."""
+    client = await connected(LMKClientType.HEADLESS)
+    received: list[LMKNotification] = []
+    listen = asyncio.create_task(client.ws_listen_for_notifications(received.append))
+    await asyncio.sleep(0)
+
+    response = await client.ws_send_notification(
+        LMKNotification(title="Self"), [client.lmk_user_id]
+    )
+
+    assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+    await _wait_for(lambda: len(received) == 1)
+    assert received[0].title == "Self"
+    assert client.stats.notifications_received == 1
+
+    await client.ws_close()
+    async with asyncio.timeout(5):
+        await listen
+    assert not client._listeners  # noqa: SLF001
+
+
+async def test_listener_error_keeps_reading(
+    connected: Connected,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an error in a listener does not stop the next notification."""
+    client = await connected(LMKClientType.HEADLESS)
+    received: list[LMKNotification] = []
+
+    def _listener(notification: LMKNotification) -> None:
+        if notification.title == "Fail":
+            raise ValueError
+        received.append(notification)
+
+    listen = asyncio.create_task(client.ws_listen_for_notifications(_listener))
+    await asyncio.sleep(0)
+
+    for title in ("Fail", "Next"):
+        await client.ws_send_notification(
+            LMKNotification(title=title), [client.lmk_user_id]
+        )
+
+    await _wait_for(lambda: len(received) == 1)
+    assert received[0].title == "Next"
+    assert "Error in notification listener" in caplog.text
+
+    await client.ws_close()
+    async with asyncio.timeout(5):
+        await listen
+
+
+async def test_listen_when_not_connected() -> None:
+    """Test listening without a connection fails."""
+    client = LMKClient(
+        "127.0.0.1",
+        0,
+        LMKClientType.HEADLESS,
+        generate_user_id(LMKClientType.HEADLESS),
+    )
+
+    with pytest.raises(LMKNotConnectedError):
+        await client.ws_listen_for_notifications(lambda _notification: None)
+
+
+async def test_pipelined_sends(connected: Connected) -> None:
+    """Test a batch of sends on one connection is delivered in order."""
+    listener = await connected(LMKClientType.HEADLESS)
+    sender = await connected()
+    stream = listener.notifications(maxsize=0)
+
+    result = await sender.ws_send_notifications(
+        (
+            (LMKNotification(title=str(index)), [listener.lmk_user_id])
+            for index in range(200)
+        ),
+        window=16,
+    )
+
+    assert result.succeeded == 200
+    assert sender.ws_pending == 0
+    assert [(await anext(stream)).title for _ in range(200)] == [
+        str(index) for index in range(200)
+    ]
+
+
+async def test_send_async_iterable(echo_port: int) -> None:
+    """Test a batch is read from an async iterable."""
+
+    async def _notifications() -> AsyncIterator[tuple[LMKNotification, None]]:
+        for index in range(10):
+            yield LMKNotification(title=str(index)), None
+
+    async with _echo_client(echo_port) as client:
+        await client.ws_connect()
+
+        result = await client.ws_send_notifications(_notifications(), window=4)
+
+    assert [response.message for response in result.responses] == [
+        str(index) for index in range(10)
+    ]
+
+
+async def test_send_window_must_be_positive(connected: Connected) -> None:
+    """Test a window below 1 is rejected instead of hanging."""
+    sender = await connected()
+
+    with pytest.raises(ValueError, match="Window"):
+        await sender.ws_send_notifications([], window=0)
+
+
+async def test_batch_continues_after_timeout(echo_port: int) -> None:
+    """Test a timed out send gets an error response in the batch."""
+    async with _echo_client(echo_port, request_timeout=0.1) as client:
+        await client.ws_connect()
+
+        result = await client.ws_send_notifications(
+            [(LMKNotification(title="slow"), None), (LMKNotification(title="x"), None)]
+        )
+
+    assert [response.type for response in result.responses] == [
+        LMKWSResponseType.ERROR,
+        LMKWSResponseType.ERROR,
+    ]
+    assert result.responses[0].message == "Timed out waiting for response"
+
+
+async def test_batch_continues_after_connection_closed(echo_port: int) -> None:
+    """Test sends after the connection closed mid-batch get error responses."""
+    async with _echo_client(echo_port) as client:
+        await client.ws_connect()
+
+        result = await client.ws_send_notifications(
+            (
+                (LMKNotification(title="close" if index == 50 else str(index)), None)
+                for index in range(100)
+            ),
+            window=1,
+        )
+
+    assert len(result.responses) == 100
+    assert result.succeeded == 50
+    assert all(
+        response.type == LMKWSResponseType.ERROR for response in result.responses[50:]
+    )
+    assert result.responses[-1].message == "Failed to send notification"
+
+
+async def test_cancel_batch(echo_port: int) -> None:
+    """Test cancelling a batch cancels the sends in flight."""
+    started = asyncio.Event()
+
+    async def _notifications() -> AsyncIterator[tuple[LMKNotification, None]]:
+        yield LMKNotification(title="slow"), None
+        started.set()
+        await asyncio.Event().wait()
+        yield LMKNotification(title="never"), None  # pragma: no cover
+
+    async with _echo_client(echo_port) as client:
+        await client.ws_connect()
+        batch = asyncio.create_task(client.ws_send_notifications(_notifications()))
+        await started.wait()
+
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+
+
+async def test_keep_alive_reconnects(
+    server: LMKTestServer,
+    connected: Connected,
+) -> None:
+    """Test the client reconnects and registers after the server drops it."""
+    client = await connected(
+        config=LMKClientConfig(backoff_min=0.01, backoff_max=0.05),
+    )
+    keep_alive = asyncio.create_task(client.ws_keep_alive())
+
+    await server.clients[client.lmk_user_id].close()
+    await _wait_for(lambda: client.stats.reconnects == 1)
+
+    response = await client.ws_send_notification(LMKNotification(title="Back"))
+    assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+    assert client.lmk_user_id in server.clients
+
+    await client.ws_close()
+    async with asyncio.timeout(5):
+        await keep_alive
+
+
+async def test_keep_alive_retries_while_server_down(
+    server: LMKTestServer,
+    connected: Connected,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test reconnecting is retried until the server is back."""
+    client = await connected()
+    keep_alive = asyncio.create_task(client.ws_keep_alive(0.01, 0.05))
+
+    await server.stop()
+    await _wait_for(lambda: "Failed to reconnect" in caplog.text)
+    await server.start()
+    await _wait_for(lambda: client.stats.reconnects == 1)
+
+    assert client.ws_connected
+    await client.ws_close()
+    async with asyncio.timeout(5):
+        await keep_alive
+
+
+async def test_keep_alive_retries_failed_register(
+    reject_port: int,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a connection that fails to register is dropped and retried."""
+    monkeypatch.setattr("letmeknowclient.lmk.random.uniform", lambda _a, b: b)
+    caplog.set_level(logging.DEBUG)
+
+    async with _echo_client(reject_port) as client:
+        keep_alive = asyncio.create_task(client.ws_keep_alive(0.1, 0.1))
+        await _wait_for(lambda: "Reconnecting in" in caplog.text)
+        assert "Failed to register" in caplog.text
+
+        # Closed while waiting to retry
+        await client.ws_close()
+        async with asyncio.timeout(5):
+            await keep_alive
+
+    assert not client.ws_connected
+    assert not client.stats.reconnects
+
+
+async def test_keep_alive_follows_replaced_connection(connected: Connected) -> None:
+    """Test a connection replaced with connect is not reconnected again."""
+    client = await connected()
+    keep_alive = asyncio.create_task(client.ws_keep_alive())
+    await asyncio.sleep(0)
+
+    await client.connect()
+    await client.ws_wait_registered()
+    await asyncio.sleep(0)
+
+    assert not client.stats.reconnects
+    await client.ws_close()
+    async with asyncio.timeout(5):
+        await keep_alive
+
+
+async def test_cancel_keep_alive(connected: Connected) -> None:
+    """Test cancelling keep alive stops it, leaving the connection open."""
+    client = await connected()
+    keep_alive = asyncio.create_task(client.ws_keep_alive())
+    await asyncio.sleep(0)
+
+    keep_alive.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await keep_alive
+
+    assert client.ws_connected
+
+
+async def test_wait_closed_times_out(connected: Connected) -> None:
+    """Test a timeout around waiting for the connection to close is raised."""
+    client = await connected()
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.05):
+            await client.ws_wait_closed()
+
+    assert client.ws_connected
+
+
+def test_frame_cache_keeps_recent_notifications() -> None:
+    """Test encoded notifications are reused, keeping the most recent ones."""
+    client = _echo_client(0, config=LMKClientConfig(frame_cache_size=2))
+    first, second, third = (LMKNotification(title=str(index)) for index in range(3))
+
+    for notification in (first, second, first, third):
+        client._encode_notification(notification, ["client-1"])  # noqa: SLF001
+
+    # The first notification was used again, so the second was evicted
+    assert list(client._frame_cache or ()) == [  # noqa: SLF001
+        first.cache_key,
+        third.cache_key,
+    ]
+    frame = client._encode_notification(third, ["headless-1"])  # noqa: SLF001
+    assert json.loads(frame) == {
+        "type": "notification",
+        "data": third.to_dict(),
+        "targets": ["headless-1"],
+    }
+
+
+def test_frame_cache_disabled() -> None:
+    """Test nothing is cached with a cache size of 0."""
+    client = _echo_client(0, config=LMKClientConfig(frame_cache_size=0))
+
+    client._encode_notification(LMKNotification(title="Once"), [])  # noqa: SLF001
+
+    assert not client._frame_cache  # noqa: SLF001
+
+
+async def test_listen_coroutine_callback_runs_off_reader(connected: Connected) -> None:
+    """Test a waiting coroutine callback does not hold back responses."""
+    client = await connected(LMKClientType.HEADLESS)
+    release = asyncio.Event()
+    received: list[LMKNotification] = []
+
+    async def _callback(notification: LMKNotification) -> None:
+        await release.wait()
+        received.append(notification)
+
+    listen = asyncio.create_task(client.ws_listen_for_notifications(_callback))
+    await asyncio.sleep(0)
+
+    for title in ("First", "Second"):
+        response = await client.ws_send_notification(
+            LMKNotification(title=title), [client.lmk_user_id]
+        )
+        assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+    await _wait_for(lambda: client.stats.notifications_received == 2)
+    assert not received
+
+    release.set()
+    # Closing waits for the callbacks in flight
+    await client.ws_close()
+    async with asyncio.timeout(5):
+        await listen
+    assert {notification.title for notification in received} == {"First", "Second"}
+
+
+async def test_listen_ordered_callback(connected: Connected) -> None:
+    """Test ordered callbacks run one at a time, in the order received."""
+    client = await connected(LMKClientType.HEADLESS)
+    received: list[str | None] = []
+
+    async def _callback(notification: LMKNotification) -> None:
+        # Later notifications would finish first if run concurrently
+        await asyncio.sleep(0.01 * (5 - int(notification.title or 0)))
+        received.append(notification.title)
+
+    listen = asyncio.create_task(
+        client.ws_listen_for_notifications(_callback, ordered=True, max_concurrency=2)
+    )
+    await asyncio.sleep(0)
+
+    await client.ws_send_notifications(
+        (LMKNotification(title=str(index)), [client.lmk_user_id]) for index in range(5)
+    )
+    await _wait_for(lambda: len(received) == 5)
+
+    assert received == [str(index) for index in range(5)]
+    listen.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listen
+
+
+@pytest.mark.parametrize("own_executor", [False, True])
+async def test_listen_blocking_callback_runs_in_executor(
+    connected: Connected,
+    own_executor: bool,  # noqa: FBT001
+) -> None:
+    """Test a blocking callback runs off the event loop thread."""
+    client = await connected(LMKClientType.HEADLESS)
+    threads: list[int] = []
+
+    def _callback(_notification: LMKNotification) -> None:
+        threads.append(threading.get_ident())
+
+    with ThreadPoolExecutor(1) as executor:
+        listen = asyncio.create_task(
+            client.ws_listen_for_notifications(
+                _callback, blocking=True, executor=executor if own_executor else None
+            )
+        )
+        await asyncio.sleep(0)
+
+        await client.ws_send_notification(LMKNotification(), [client.lmk_user_id])
+        await _wait_for(lambda: len(threads) == 1)
+
+        assert threads[0] != threading.get_ident()
+        await client.ws_close()
+        async with asyncio.timeout(5):
+            await listen
+
+
+async def test_cancel_listen_cancels_callbacks(connected: Connected) -> None:
+    """Test cancelling the listener cancels the callbacks in flight."""
+    client = await connected(LMKClientType.HEADLESS)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _callback(_notification: LMKNotification) -> None:
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    listen = asyncio.create_task(client.ws_listen_for_notifications(_callback))
+    await asyncio.sleep(0)
+    await client.ws_send_notification(LMKNotification(), [client.lmk_user_id])
+    await started.wait()
+
+    listen.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listen
+
+    assert cancelled.is_set()
+    assert not client._listeners  # noqa: SLF001
+    assert client.ws_connected
+
+
+async def test_batches_capped_by_size(connected: Connected) -> None:
+    """Test batches are filled up to the maximum size."""
+    listener = await connected(LMKClientType.HEADLESS)
+    sender = await connected()
+    batches: list[list[str | None]] = []
+
+    async def _callback(batch: list[LMKNotification]) -> None:
+        batches.append([notification.title for notification in batch])
+
+    listen = asyncio.create_task(
+        listener.ws_listen_for_notification_batches(
+            _callback, max_batch_size=3, max_batch_delay=0.5
+        )
+    )
+    await asyncio.sleep(0)
+
+    # The first batch waits for the rest to arrive, the others are buffered
+    await sender.ws_send_notification(
+        LMKNotification(title="0"), [listener.lmk_user_id]
+    )
+    await _wait_for(lambda: listener.stats.notifications_received == 1)
+    await sender.ws_send_notifications(
+        (LMKNotification(title=str(index)), [listener.lmk_user_id])
+        for index in range(1, 7)
+    )
+    await _wait_for(lambda: len(batches) == 3)
+
+    assert batches == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+    await listener.ws_close()
+    async with asyncio.timeout(5):
+        await listen
+
+
+async def test_batches_capped_by_delay(connected: Connected) -> None:
+    """Test a batch that does not fill up is delivered after the delay."""
+    listener = await connected(LMKClientType.HEADLESS)
+    batches: list[list[LMKNotification]] = []
+
+    listen = asyncio.create_task(
+        listener.ws_listen_for_notification_batches(
+            batches.append, max_batch_delay=0.05
+        )
+    )
+    await asyncio.sleep(0)
+
+    await listener.ws_send_notification(LMKNotification(), [listener.lmk_user_id])
+    await _wait_for(lambda: len(batches) == 1)
+
+    assert listener.ws_connected
+    await listener.ws_close()
+    async with asyncio.timeout(5):
+        await listen
+
+
+async def test_batch_delivered_when_connection_closes(connected: Connected) -> None:
+    """Test a batch waiting to fill up is delivered when the connection closes."""
+    listener = await connected(LMKClientType.HEADLESS)
+    batches: list[list[LMKNotification]] = []
+
+    listen = asyncio.create_task(
+        listener.ws_listen_for_notification_batches(batches.append, max_batch_delay=60)
+    )
+    await asyncio.sleep(0)
+
+    await listener.ws_send_notification(LMKNotification(), [listener.lmk_user_id])
+    await _wait_for(lambda: listener.stats.notifications_received == 1)
+    assert not batches
+
+    await listener.ws_close()
+    async with asyncio.timeout(5):
+        await listen
+
+    assert [len(batch) for batch in batches] == [1]
+
+
+async def test_batch_callback_error_is_logged(
+    connected: Connected,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an error in a batch callback does not stop the listener."""
+    listener = await connected(LMKClientType.HEADLESS)
+    calls: list[int] = []
+
+    def _callback(batch: list[LMKNotification]) -> None:
+        calls.append(len(batch))
+        raise ValueError
+
+    listen = asyncio.create_task(listener.ws_listen_for_notification_batches(_callback))
+    await asyncio.sleep(0)
+
+    for _ in range(2):
+        await listener.ws_send_notification(LMKNotification(), [listener.lmk_user_id])
+        await _wait_for(lambda: len(calls) == listener.stats.notifications_received)
+
+    assert "Error in notification listener" in caplog.text
+    listen.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listen
+
+
+async def test_batch_size_must_be_positive(connected: Connected) -> None:
+    """Test a batch size below 1 is rejected."""
+    listener = await connected(LMKClientType.HEADLESS)
+
+    with pytest.raises(ValueError, match="Batch size"):
+        await listener.ws_listen_for_notification_batches(
+            lambda _batch: None, max_batch_size=0
+        )
+
+
+async def test_batches_when_not_connected() -> None:
+    """Test listening for batches without a connection fails."""
+    client = _echo_client(0)
+
+    with pytest.raises(LMKNotConnectedError):
+        await client.ws_listen_for_notification_batches(lambda _batch: None)
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        "{",
+        "[1, 2]",
+        '"text"',
+        '{"type": "notification", "data": "Not a notification"}',
+        '{"type": "notification", "data": {"image": {}}}',
+    ],
+)
+async def test_malformed_frames_are_skipped(frames_port: int, frame: str) -> None:
+    """Test frames that are not a notification or response are skipped."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+
+        response = await client.ws_send_notification(
+            _frames({"text": frame}, _response("After"))
+        )
+
+        assert response.message == "After"
+        assert client.stats.decode_errors == 1
+        assert client.ws_connected
+
+
+async def test_malformed_response_takes_its_slot(frames_port: int) -> None:
+    """Test a malformed response answers its request with an error."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+
+        response = await client.ws_send_notification(
+            _frames({"text": '{"type": "notificationSent"}'})
+        )
+        assert response.type == LMKWSResponseType.ERROR
+        assert response.message == "Malformed response"
+
+        response = await client.ws_send_notification(_frames(_response("Next")))
+        assert response.message == "Next"
+        assert client.stats.decode_errors == 1
+
+
+async def test_binary_frames_are_decoded(frames_port: int) -> None:
+    """Test a response in a binary frame is handled like a text one."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+
+        response = await client.ws_send_notification(
+            _frames({"binary": _response("Binary")["text"]})
+        )
+
+        assert response.message == "Binary"
+
+
+async def test_response_without_request_is_dropped(frames_port: int) -> None:
+    """Test a response no request is waiting for does not answer a later one."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+
+        response = await client.ws_send_notification(
+            _frames(_response("First"), _response("Extra"))
+        )
+        assert response.message == "First"
+        await _wait_for(lambda: client.stats.responses_received == 2)
+
+        response = await client.ws_send_notification(_frames(_response("Next")))
+        assert response.message == "Next"
+
+
+async def test_close_reason(frames_port: int) -> None:
+    """Test the close code and message of the server are kept as the reason."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+
+        response = await client.ws_send_notification(_frames({"close": 4000}))
+
+        assert isinstance(response, LMKWSResponseError)
+        assert response.error == "Connection closed (4000): Bye"
+        assert client.ws_close_reason == "Connection closed (4000): Bye"
+
+
+async def test_error_reason(
+    frames_port: int,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a connection error closes with the error as reason."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+        ws = client._ws  # noqa: SLF001
+        assert ws is not None
+        receive = ws.receive
+        messages = [WSMessage(WSMsgType.ERROR, ValueError("Bad frame"), None)]
+
+        async def _receive() -> WSMessage:
+            return messages.pop() if messages else await receive()
+
+        # Read once the reader is done with the frame it is waiting for
+        monkeypatch.setattr(ws, "receive", _receive)
+        await client.ws_send_notification(_frames(_response("First")))
+
+        await _wait_for(lambda: not client.ws_connected)
+        assert client.ws_close_reason == "Connection error: Bad frame"
+
+
+async def test_other_frames_are_ignored(
+    frames_port: int,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test frames other than data and close frames do not stop the reader."""
+    async with _echo_client(frames_port) as client:
+        await client.ws_connect()
+        ws = client._ws  # noqa: SLF001
+        assert ws is not None
+        receive = ws.receive
+        messages = [WSMessage(WSMsgType.PONG, b"", None)]
+
+        async def _receive() -> WSMessage:
+            return messages.pop() if messages else await receive()
+
+        # Read once the reader is done with the frame it is waiting for
+        monkeypatch.setattr(ws, "receive", _receive)
+        await client.ws_send_notification(_frames(_response("First")))
+
+        response = await client.ws_send_notification(_frames(_response("Next")))
+
+        assert response.message == "Next"
+        assert client.stats.ignored_frames == 1
+
+
+async def test_connect_pipelines_register(echo_port: int) -> None:
+    """Test sends go out behind the register frame, without waiting for it."""
+    async with _echo_client(echo_port) as client:
+        await client.connect()
+        send = asyncio.create_task(
+            client.ws_send_notification(LMKNotification(title="First"))
+        )
+
+        registered = await client.ws_wait_registered()
+        assert registered.type == LMKWSResponseType.REGISTER
+        assert registered.message == client.lmk_user_id
+        assert (await send).message == "First"
+
+        # The response is kept for every waiter
+        assert await client.ws_wait_registered() == registered
+
+
+async def test_wait_registered_needs_connect(echo_port: int) -> None:
+    """Test waiting to register needs a register frame sent by connect."""
+    async with _echo_client(echo_port) as client:
+        with pytest.raises(LMKNotConnectedError):
+            await client.ws_wait_registered()
+
+        await client.connect()
+        await client.ws_wait_registered()
+
+        # Connecting again without registering
+        await client.ws_connect()
+        with pytest.raises(LMKNotConnectedError):
+            await client.ws_wait_registered()
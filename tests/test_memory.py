@@ -0,0 +1,100 @@
+"""Measure the memory held by idle registered connections."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import pytest
+
+from letmeknowclient import LMKClient, LMKClientType, generate_user_id
+from letmeknowclient.server import LMKTestServer
+from letmeknowclient.session import SESSION_MANAGER
+from letmeknowclient.utils import connect_client
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from multiprocessing.queues import Queue
+
+CONNECTIONS = 200
+# Bytes per idle registered connection, with headroom over the measured value
+MAX_BYTES_PER_CONNECTION = 32 * 1024
+
+
+async def _serve(ports: Queue[int]) -> None:
+    """Run the server until the process is stopped."""
+    async with LMKTestServer() as server:
+        ports.put(server.port)
+        await asyncio.Event().wait()
+
+
+def _run_server(ports: Queue[int]) -> None:
+    """Run the server in the child process."""
+    asyncio.run(_serve(ports))
+
+
+@pytest.fixture
+def server_port() -> Iterator[int]:
+    """Port of a stand-in server in a child process.
+
+    The server runs in its own process, so only the memory allocated by the
+    clients is traced.
+    """
+    context = multiprocessing.get_context("spawn")
+    ports: Queue[int] = context.Queue()
+    server = context.Process(target=_run_server, args=(ports,), daemon=True)
+    server.start()
+    try:
+        yield ports.get(timeout=30)
+    finally:
+        server.terminate()
+        server.join()
+
+
+def _listener(port: int) -> LMKClient:
+    """Create a headless listener using the shared session."""
+    return LMKClient(
+        "127.0.0.1",
+        port,
+        LMKClientType.HEADLESS,
+        generate_user_id(LMKClientType.HEADLESS),
+    )
+
+
+async def test_bytes_per_idle_connection(
+    server_port: int,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Report the bytes allocated per idle registered connection."""
+    async with contextlib.AsyncExitStack() as stack:
+        # Keep the shared session open, and warm up imports and caches,
+        # outside of the measurement
+        await stack.enter_async_context(SESSION_MANAGER.session())
+        async with _listener(server_port) as client:
+            await connect_client(client)
+
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            clients = [_listener(server_port) for _ in range(CONNECTIONS)]
+            try:
+                await asyncio.gather(*(connect_client(client) for client in clients))
+                await asyncio.sleep(0.1)
+                allocated = tracemalloc.get_traced_memory()[0] - start
+            finally:
+                # Closed on exit, after the stack was left out of the measurement
+                for client in clients:
+                    await stack.enter_async_context(client)
+        finally:
+            tracemalloc.stop()
+
+        assert all(client.ws_connected for client in clients)
+        assert SESSION_MANAGER.sessions == 1
+
+    per_connection = allocated / CONNECTIONS
+    record_property("bytes_per_connection", round(per_connection))
+    print(f"{per_connection:,.0f} bytes per idle registered connection")  # noqa: T201
+    assert per_connection < MAX_BYTES_PER_CONNECTION
@@ -0,0 +1,249 @@
+"""Tests for the LetMeKnow models."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import product
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from letmeknowclient import (
+    TARGETS_ALL_CLIENTS,
+    LMKClientConfig,
+    LMKClientType,
+    LMKLazyNotification,
+    LMKNotification,
+    LMKNotificationImage,
+    LMKWSBatchResult,
+    LMKWSNotification,
+    LMKWSRegister,
+    LMKWSRequestType,
+    LMKWSResponseError,
+    LMKWSResponseSuccess,
+    LMKWSResponseType,
+    get_json_codec,
+)
+from letmeknowclient.codec import CODEC_JSON
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from letmeknowclient import LMKClient
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+NOTIFICATIONS = [
+    LMKNotification(*fields)  # type: ignore[arg-type]
+    for fields in product(
+        ("status", None),
+        ('Café "open"', LMKClientType.HEADLESS, None),
+        ("nas-01", None),
+        ("Line\nbreak", None),
+        (LMKNotificationImage(url="https://example.com/a.png"), None),
+        (5000, 1.5, True, None),
+    )
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_to_json_matches_json_dumps(compact: bool) -> None:  # noqa: FBT001
+    """Test the direct encoder writes the same string as json.dumps of to_dict."""
+    for notification in NOTIFICATIONS:
+        frame = LMKWSNotification(
+            type=LMKWSRequestType.NOTIFICATION,
+            data=notification,
+            targets=TARGETS_ALL_CLIENTS,
+        )
+
+        assert notification.to_json(compact=compact) == json.dumps(
+            notification.to_dict(compact=compact)
+        )
+        assert frame.to_json(compact=compact) == json.dumps(
+            frame.to_dict(compact=compact)
+        )
+
+
+def test_compact_leaves_out_unset_fields() -> None:
+    """Test compact frames only hold the fields that are set."""
+    notification = LMKNotification(title="Ping", timeout=0)
+
+    assert notification.to_dict(compact=True) == {"title": "Ping", "timeout": 0}
+    assert notification.to_json(compact=True) == '{"title": "Ping", "timeout": 0}'
+    assert LMKNotification.from_dict(notification.to_dict(compact=True)) == notification
+
+
+@pytest.mark.parametrize("compact", [False, True])
+async def test_encoded_frames_round_trip(
+    connected: Connected,
+    compact: bool,  # noqa: FBT001
+) -> None:
+    """Test notifications arrive unchanged with every encoder and codec."""
+    codecs = {get_json_codec().name, CODEC_JSON}
+    listener = await connected(LMKClientType.HEADLESS)
+    stream = listener.notifications(maxsize=0)
+
+    for codec in codecs:
+        sender = await connected(
+            config=LMKClientConfig(json_codec=get_json_codec(codec), compact=compact)
+        )
+        # Full frames send an unset type as "None"
+        for notification in (item for item in NOTIFICATIONS if item.type):
+            await sender.ws_send_notification(notification, [listener.lmk_user_id])
+            assert await anext(stream) == notification
+
+
+def test_cache_key_tells_types_apart() -> None:
+    """Test values that are equal but encode differently have different keys."""
+    keys = {
+        LMKNotification(timeout=value).cache_key  # type: ignore[arg-type]
+        for value in (1, 1.0, True)
+    }
+
+    assert len(keys) == 3
+
+
+def test_lazy_notification_equals_notification() -> None:
+    """Test a lazy notification compares equal to the decoded notification."""
+    data: dict[str, Any] = {
+        "type": "status",
+        "title": "Backup",
+        "image": {"url": "https://example.com/a.png"},
+    }
+    lazy = LMKLazyNotification(data)
+    notification = LMKNotification.from_dict(data)
+
+    assert lazy == notification
+    assert notification == lazy
+    assert lazy != replace(notification, title="Other")
+    assert lazy != "Backup"
+    assert replace(lazy.to_notification(), title="Other").title == "Other"
+
+
+@pytest.mark.parametrize("notification", NOTIFICATIONS)
+def test_lazy_notification_reads_fields(notification: LMKNotification) -> None:
+    """Test a lazy notification reads the same fields as a decoded one."""
+    data = notification.to_dict(compact=True)
+
+    assert LMKLazyNotification.from_dict(data).to_notification() == notification
+    assert LMKLazyNotification.from_dict_trusted(data) == notification
+
+
+def test_lazy_notification_builds_image_once() -> None:
+    """Test the image is built on first access and kept after."""
+    lazy = LMKLazyNotification({"image": {"url": "https://example.com/a.png"}})
+
+    assert lazy.image is lazy.image
+    assert lazy.image == LMKNotificationImage(url="https://example.com/a.png")
+
+
+def test_lazy_notification_setters() -> None:
+    """Test setting the fields of a lazy notification."""
+    lazy = LMKLazyNotification({"image": {"url": "https://example.com/a.png"}})
+    notification = LMKNotification(
+        type="status",
+        title="Title",
+        subtitle="Subtitle",
+        content="Content",
+        image=None,
+        timeout=5000,
+    )
+
+    lazy.type = notification.type
+    lazy.title = notification.title
+    lazy.subtitle = notification.subtitle
+    lazy.content = notification.content
+    lazy.image = notification.image
+    lazy.timeout = notification.timeout
+
+    assert lazy == notification
+
+
+def test_lazy_notification_needs_a_dict() -> None:
+    """Test a lazy notification is not created from other data."""
+    with pytest.raises(TypeError, match="must be a dict, not list"):
+        LMKLazyNotification([])  # type: ignore[arg-type]
+
+
+async def test_client_decodes_lazily(connected: Connected) -> None:
+    """Test a client with lazy decoding receives lazy notifications."""
+    listener = await connected(
+        LMKClientType.HEADLESS,
+        config=LMKClientConfig(lazy_decode=True),
+    )
+    stream = listener.notifications(maxsize=0)
+    sender = await connected()
+
+    for notification in (item for item in NOTIFICATIONS if item.type):
+        await sender.ws_send_notification(notification, [listener.lmk_user_id])
+        received = await anext(stream)
+        assert isinstance(received, LMKLazyNotification)
+        assert received == notification
+
+
+@pytest.mark.parametrize(
+    ("model", "data"),
+    [
+        *((LMKNotification, item.to_dict(compact=True)) for item in NOTIFICATIONS),
+        (LMKNotificationImage, {"url": "https://example.com/a.png"}),
+        (LMKWSRegister, {"type": "register", "userID": "client-1"}),
+        (
+            LMKWSNotification,
+            {
+                "type": "notification",
+                "data": LMKNotification(
+                    type="status",
+                    title="Backup",
+                    image=LMKNotificationImage(url="https://example.com/a.png"),
+                ).to_dict(),
+                "targets": [TARGETS_ALL_CLIENTS],
+            },
+        ),
+        (
+            LMKWSResponseError,
+            {"type": "error", "message": "Failed", "error": "Not registered"},
+        ),
+        (
+            LMKWSResponseSuccess,
+            {"type": "notificationSent", "succeeded": True, "message": "Sent"},
+        ),
+    ],
+)
+def test_trusted_decode_matches_decode(model: Any, data: dict[str, Any]) -> None:
+    """Test the trusted constructors decode the same models as from_dict."""
+    trusted = model.from_dict_trusted(data)
+    decoded = model.from_dict(data)
+
+    assert trusted == decoded
+    # Enum types are looked up, not left as their str values
+    assert type(getattr(trusted, "type", None)) is type(getattr(decoded, "type", None))
+    if model is not LMKNotification:
+        assert trusted.to_dict() == data
+
+
+async def test_client_decodes_trusted(connected: Connected) -> None:
+    """Test a client with trusted decoding receives the same frames."""
+    config = LMKClientConfig(trusted_decode=True)
+    listener = await connected(LMKClientType.HEADLESS, config=config)
+    stream = listener.notifications(maxsize=0)
+    sender = await connected(config=config)
+
+    for notification in (item for item in NOTIFICATIONS if item.type):
+        response = await sender.ws_send_notification(
+            notification, [listener.lmk_user_id]
+        )
+        assert isinstance(response, LMKWSResponseSuccess)
+        assert response.type is LMKWSResponseType.NOTIFICATION_SENT
+        assert await anext(stream) == notification
+
+
+@pytest.mark.parametrize(("duration", "throughput"), [(0.5, 6.0), (0.0, 0.0)])
+def test_batch_result(duration: float, throughput: float) -> None:
+    """Test the successful sends and the throughput of a batch."""
+    sent = LMKWSResponseSuccess(LMKWSResponseType.NOTIFICATION_SENT, True, "Sent")  # noqa: FBT003
+    failed = LMKWSResponseError(LMKWSResponseType.ERROR, "Failed", "Timed out")
+    result = LMKWSBatchResult(responses=[sent, failed, sent], duration=duration)
+
+    assert result.succeeded == 2
+    assert result.throughput == throughput
@@ -0,0 +1,157 @@
+"""Tests for the LetMeKnow client pool."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from letmeknowclient import (
+    TARGETS_ALL_HEADLESS,
+    LMKClientPool,
+    LMKError,
+    LMKNotConnectedError,
+    LMKNotification,
+    LMKWSResponseType,
+)
+from letmeknowclient.session import SESSION_MANAGER
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from letmeknowclient.server import LMKTestServer
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Wait until a condition is met."""
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def first_only() -> AsyncIterator[tuple[int, list[web.WebSocketResponse]]]:
+    """Port of a server only registering the first connection, and its sockets."""
+    sockets: list[web.WebSocketResponse] = []
+
+    async def _handle(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sockets.append(ws)
+        registered = len(sockets) == 1
+        async for _message in ws:
+            await ws.send_json(
+                {"type": LMKWSResponseType.REGISTER, "succeeded": True, "message": ""}
+                if registered
+                else {"type": LMKWSResponseType.ERROR, "message": "", "error": "Full"}
+            )
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/websocket", _handle)
+    async with TestServer(app, host="127.0.0.1") as server:
+        assert server.port is not None
+        yield server.port, sockets
+
+
+async def test_pool_connects_and_sends(server: LMKTestServer) -> None:
+    """Test the pool registers its connections and sends on them."""
+    async with LMKClientPool(server.host, server.port, size=3) as pool:
+        assert len(pool.clients) == 3
+        assert all(client.lmk_user_id in server.clients for client in pool.clients)
+
+        response = await pool.ws_send_notification(
+            LMKNotification(title="Pool"), TARGETS_ALL_HEADLESS
+        )
+
+        assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+
+    assert not pool.clients
+    assert SESSION_MANAGER.sessions == 0
+    await _wait_for(lambda: not server.clients)
+
+
+async def test_pool_sends_on_least_loaded(echo_port: int) -> None:
+    """Test a send goes to the connection with the fewest requests in flight."""
+    async with LMKClientPool("127.0.0.1", echo_port, size=2) as pool:
+        sends = [
+            asyncio.create_task(
+                pool.ws_send_notification(LMKNotification(title="slow"))
+            )
+            for _ in range(2)
+        ]
+        await _wait_for(lambda: sum(client.ws_pending for client in pool.clients) == 2)
+
+        assert [client.ws_pending for client in pool.clients] == [1, 1]
+        await asyncio.gather(*sends)
+
+
+async def test_pool_replaces_closed_connection(server: LMKTestServer) -> None:
+    """Test a connection closed by the server is replaced."""
+    async with LMKClientPool(server.host, server.port, size=2) as pool:
+        closed = pool.clients[0]
+
+        await server.clients[closed.lmk_user_id].close()
+        await _wait_for(
+            lambda: len(pool.clients) == 2 and closed not in pool.clients,
+        )
+
+        assert len(server.clients) == 2
+
+
+async def test_pool_retries_replacing(
+    server: LMKTestServer,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test replacing a connection is retried while the server is down."""
+    async with LMKClientPool(
+        server.host, server.port, size=1, replace_interval=0.01
+    ) as pool:
+        await server.stop()
+        await _wait_for(lambda: "Failed to replace pool connection" in caplog.text)
+
+        with pytest.raises(LMKNotConnectedError):
+            await pool.ws_send_notification(LMKNotification(title="Down"))
+
+
+async def test_pool_closes_on_failed_connect(
+    first_only: tuple[int, list[web.WebSocketResponse]],
+) -> None:
+    """Test the connections that did open are closed when one fails."""
+    port, sockets = first_only
+    pool = LMKClientPool("127.0.0.1", port, size=3)
+
+    with pytest.raises(LMKError, match="Failed to register"):
+        await pool.connect()
+
+    assert not pool.clients
+    assert pool.session is None
+    await _wait_for(lambda: all(ws.closed for ws in sockets))
+
+
+async def test_pool_keeps_given_session(server: LMKTestServer) -> None:
+    """Test a session given to the pool is left open."""
+    async with ClientSession() as session:
+        async with LMKClientPool(
+            server.host, server.port, size=1, session=session
+        ) as pool:
+            assert pool.session is session
+
+        assert not session.closed
+
+
+async def test_pool_over_unix_socket(unix_server: LMKTestServer) -> None:
+    """Test the pool connects over a Unix socket, on a session of its own."""
+    async with LMKClientPool(
+        "localhost", 1, size=2, lmk_socket_path=unix_server.path
+    ) as pool:
+        response = await pool.ws_send_notification(LMKNotification(title="Unix"))
+
+        assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+        assert len(unix_server.clients) == 2
+        assert SESSION_MANAGER.sessions == 1
+
+    assert SESSION_MANAGER.sessions == 0
@@ -0,0 +1,200 @@
+"""Tests for the stand-in LetMeKnow server."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import (
+    ClientSession,
+    ClientWebSocketResponse,
+    UnixConnector,
+    WSMessage,
+    WSMsgType,
+    web,
+)
+import pytest
+
+from letmeknowclient import (
+    TARGETS_ALL_HEADLESS,
+    LMKClientType,
+    LMKNotification,
+    LMKWSRequestType,
+    LMKWSResponseType,
+)
+from letmeknowclient.server import LMKTestServer
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from letmeknowclient import LMKClient
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Wait until a condition is met."""
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def ws(server: LMKTestServer) -> AsyncIterator[ClientWebSocketResponse]:
+    """Plain websocket connection to the server, not registered."""
+    async with (
+        ClientSession() as session,
+        session.ws_connect(f"http://{server.host}:{server.port}/websocket") as ws,
+    ):
+        yield ws
+
+
+async def _request(ws: ClientWebSocketResponse, data: str) -> dict[str, Any]:
+    """Send a frame and receive the response."""
+    await ws.send_str(data)
+    response: dict[str, Any] = await ws.receive_json()
+    return response
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        ("{", "Invalid request"),
+        ("[]", "Invalid request"),
+        ("{}", "Invalid request"),
+        ('{"type": "ping"}', "Unknown request type: ping"),
+        ('{"type": "notification", "data": {}}', "Not registered"),
+    ],
+)
+async def test_invalid_requests(
+    ws: ClientWebSocketResponse,
+    data: str,
+    message: str,
+) -> None:
+    """Test invalid requests get an error and keep the connection open."""
+    assert await _request(ws, data) == {
+        "type": LMKWSResponseType.ERROR,
+        "message": message,
+        "error": message,
+    }
+
+    response = await _request(ws, '{"type": "register", "userID": "client-1"}')
+    assert response["type"] == LMKWSResponseType.REGISTER
+
+
+async def test_binary_requests(
+    ws: ClientWebSocketResponse,
+    server: LMKTestServer,
+) -> None:
+    """Test binary frames are handled like text frames."""
+    await ws.send_bytes(b'{"type": "register", "userID": "client-1"}')
+    assert (await ws.receive_json())["type"] == LMKWSResponseType.REGISTER
+
+    await ws.send_bytes(b'{"type": "notification", "data": {}, "targets": []}')
+    # The sender is one of all the clients
+    assert (await ws.receive_json())["type"] == LMKWSRequestType.NOTIFICATION
+    assert (await ws.receive_json())["message"] == "Notification sent to 1 clients"
+    assert server.notifications_sent == 1
+
+
+async def test_other_frames_are_skipped(
+    server: LMKTestServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test frames other than data frames get no response."""
+    receive = web.WebSocketResponse.receive
+    messages = [WSMessage(WSMsgType.PONG, b"", None)]
+
+    async def _receive(
+        self: web.WebSocketResponse,
+        timeout: float | None = None,
+    ) -> WSMessage:
+        return messages.pop() if messages else await receive(self, timeout)
+
+    monkeypatch.setattr(web.WebSocketResponse, "receive", _receive)
+    async with (
+        ClientSession() as session,
+        session.ws_connect(f"http://{server.host}:{server.port}/websocket") as ws,
+    ):
+        response = await _request(ws, '{"type": "register", "userID": "client-1"}')
+
+    assert response["type"] == LMKWSResponseType.REGISTER
+    assert not messages
+
+
+async def test_notifications_go_to_matching_targets(
+    connected: Connected,
+    server: LMKTestServer,
+) -> None:
+    """Test notifications only reach the clients matching the targets."""
+    headless = await connected(LMKClientType.HEADLESS)
+    client = await connected()
+    streams = {
+        headless.lmk_user_id: headless.notifications(),
+        client.lmk_user_id: client.notifications(),
+    }
+
+    response = await client.ws_send_notification(
+        LMKNotification(title="Headless"), TARGETS_ALL_HEADLESS
+    )
+    assert response.message == "Notification sent to 1 clients"
+    response = await client.ws_send_notification(LMKNotification(title="All"), [])
+    assert response.message == "Notification sent to 2 clients"
+
+    assert (await anext(streams[headless.lmk_user_id])).title == "Headless"
+    assert (await anext(streams[headless.lmk_user_id])).title == "All"
+    assert (await anext(streams[client.lmk_user_id])).title == "All"
+    assert server.notifications_sent == 3
+
+
+async def test_notifications_skip_closed_clients(
+    connected: Connected,
+    server: LMKTestServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a client closed before it is removed is not sent to."""
+    client = await connected()
+    monkeypatch.setitem(server.clients, "headless-closed", SimpleNamespace(closed=True))
+
+    response = await client.ws_send_notification(LMKNotification(title="Skip"), [])
+
+    assert response.message == "Notification sent to 1 clients"
+
+
+async def test_clients_are_removed_when_closed(
+    ws: ClientWebSocketResponse,
+    server: LMKTestServer,
+) -> None:
+    """Test a client is removed when it closes, unless it registered again."""
+    await _request(ws, '{"type": "register", "userID": "a"}')
+    async with (
+        ClientSession() as session,
+        session.ws_connect(f"http://{server.host}:{server.port}/websocket") as other,
+    ):
+        await _request(other, '{"type": "register", "userID": "a"}')
+        replaced = server.clients["a"]
+
+        # The first connection is no longer the registered one
+        await ws.close()
+        await asyncio.sleep(0.05)
+        assert server.clients["a"] is replaced
+
+    await _wait_for(lambda: not server.clients)
+
+
+async def test_unix_socket(socket_path: str) -> None:
+    """Test the server listens on a Unix socket, removed when it stops."""
+    async with LMKTestServer(path=socket_path) as server:
+        assert Path(socket_path).is_socket()
+        async with (
+            ClientSession(connector=UnixConnector(path=socket_path)) as session,
+            session.ws_connect("http://localhost/websocket") as ws,
+        ):
+            response = await _request(ws, '{"type": "register", "userID": "unix"}')
+
+        assert response["type"] == LMKWSResponseType.REGISTER
+        assert server.port
+
+    assert not Path(socket_path).exists()
@@ -0,0 +1,164 @@
+"""Tests for the shared LetMeKnow client session."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession, TCPConnector, UnixConnector
+
+from letmeknowclient import (
+    LMKClient,
+    LMKClientType,
+    LMKNotification,
+    LMKWSResponseType,
+    generate_user_id,
+)
+from letmeknowclient.session import SESSION_MANAGER, LMKSessionManager
+from letmeknowclient.utils import connect_client
+
+if TYPE_CHECKING:
+    from letmeknowclient.server import LMKTestServer
+
+
+async def test_session_is_reference_counted() -> None:
+    """Test the session is shared, and closed when the last user releases it."""
+    manager = LMKSessionManager(ttl_dns_cache=60)
+
+    session = manager.acquire()
+    assert manager.acquire() is session
+    assert isinstance(session.connector, TCPConnector)
+    assert manager.sessions == 1
+
+    await manager.release(session)
+    assert not session.closed
+    assert manager.sessions == 1
+
+    await manager.release(session)
+    assert session.closed
+    assert manager.sessions == 0
+
+
+async def test_closed_session_is_replaced() -> None:
+    """Test a session closed by a user is replaced on the next acquire."""
+    manager = LMKSessionManager()
+    async with manager.session() as session:
+        await session.close()
+
+        async with manager.session() as replacement:
+            assert replacement is not session
+            assert not replacement.closed
+
+        assert replacement.closed
+
+    assert manager.sessions == 0
+
+
+async def test_release_unknown_session() -> None:
+    """Test releasing a session the manager does not hold closes it."""
+    manager = LMKSessionManager()
+    session = ClientSession()
+
+    async with manager.session():
+        await manager.release(session)
+
+    assert session.closed
+    assert manager.sessions == 0
+
+
+async def test_session_per_event_loop() -> None:
+    """Test each event loop gets a session of its own."""
+    manager = LMKSessionManager()
+
+    async def _acquire() -> ClientSession:
+        async with manager.session() as session:
+            return session
+
+    async with manager.session() as session:
+        other = await asyncio.to_thread(asyncio.run, _acquire())
+
+        assert other is not session
+        assert other.closed
+        assert not session.closed
+
+
+async def test_clients_share_the_session(server: LMKTestServer) -> None:
+    """Test clients without a session of their own share the managed one."""
+    clients = [
+        LMKClient(
+            server.host,
+            server.port,
+            LMKClientType.HEADLESS,
+            generate_user_id(LMKClientType.HEADLESS),
+        )
+        for _ in range(2)
+    ]
+    async with clients[0] as first:
+        await connect_client(first)
+        async with clients[1] as second:
+            await connect_client(second)
+
+            assert first.session is second.session
+            assert SESSION_MANAGER.sessions == 1
+            session = first.session
+
+        assert second.session is None
+        assert session is not None
+        assert not session.closed
+        assert first.ws_connected
+
+    assert session.closed
+    assert SESSION_MANAGER.sessions == 0
+
+
+async def test_client_keeps_given_session(server: LMKTestServer) -> None:
+    """Test a session given to a client is not closed with it."""
+    async with ClientSession() as session:
+        async with LMKClient(
+            server.host,
+            server.port,
+            LMKClientType.CLIENT,
+            generate_user_id(LMKClientType.CLIENT),
+            session=session,
+        ) as client:
+            await connect_client(client)
+
+        assert client.session is session
+        assert not session.closed
+        assert SESSION_MANAGER.sessions == 0
+
+
+async def test_session_per_socket(socket_path: str) -> None:
+    """Test a Unix socket gets a session of its own, connecting over it."""
+    manager = LMKSessionManager()
+
+    async with (
+        manager.session() as session,
+        manager.session(socket_path) as unix_session,
+    ):
+        assert unix_session is not session
+        assert isinstance(unix_session.connector, UnixConnector)
+        assert unix_session.connector.path == socket_path
+        assert manager.sessions == 2
+
+    assert manager.sessions == 0
+
+
+async def test_client_over_unix_socket(unix_server: LMKTestServer) -> None:
+    """Test a client connects over the Unix socket of the server."""
+    assert unix_server.path is not None
+    async with LMKClient(
+        # Only used for the request URL
+        "localhost",
+        1,
+        LMKClientType.CLIENT,
+        generate_user_id(LMKClientType.CLIENT),
+        lmk_socket_path=unix_server.path,
+    ) as client:
+        await connect_client(client)
+
+        response = await client.ws_send_notification(LMKNotification(title="Unix"))
+
+        assert response.type == LMKWSResponseType.NOTIFICATION_SENT
+        assert client.session is not None
+        assert isinstance(client.session.connector, UnixConnector)
@@ -0,0 +1,210 @@
+"""Tests for the notification stream."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from letmeknowclient import (
+    LMKClientType,
+    LMKNotification,
+    LMKNotificationStream,
+    LMKOverflowPolicy,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from letmeknowclient import LMKClient
+    from letmeknowclient.server import LMKTestServer
+
+    Connected = Callable[..., Awaitable[LMKClient]]
+
+
+def _notification(index: int) -> LMKNotification:
+    """Create a numbered notification."""
+    return LMKNotification(title=str(index))
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Wait until a condition is met."""
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def test_drop_newest() -> None:
+    """Test a full stream drops the notifications that did not fit."""
+    stream = LMKNotificationStream(maxsize=2, overflow=LMKOverflowPolicy.DROP_NEWEST)
+
+    for index in range(4):
+        assert stream.put(_notification(index)) is None
+
+    assert [notification.title for notification in stream.drain()] == ["0", "1"]
+    assert stream.dropped == 2
+
+
+async def test_drop_oldest() -> None:
+    """Test a full stream drops its oldest notifications."""
+    stream = LMKNotificationStream(maxsize=2, overflow=LMKOverflowPolicy.DROP_OLDEST)
+
+    for index in range(4):
+        assert stream.put(_notification(index)) is None
+
+    assert [notification.title for notification in stream.drain()] == ["2", "3"]
+    assert stream.dropped == 2
+
+
+async def test_block() -> None:
+    """Test a full blocking stream holds the producer until there is room."""
+    stream = LMKNotificationStream(maxsize=1)
+    assert stream.put(_notification(0)) is None
+
+    blocked = stream.put(_notification(1))
+    assert blocked is not None
+    put = asyncio.ensure_future(blocked)
+    await asyncio.sleep(0)
+    assert not put.done()
+
+    assert (await anext(stream)).title == "0"
+    await put
+    assert (await anext(stream)).title == "1"
+    assert stream.dropped == 0
+
+
+async def test_close_wakes_blocked_producer() -> None:
+    """Test closing a full blocking stream releases the producer."""
+    stream = LMKNotificationStream(maxsize=1)
+    stream.put(_notification(0))
+    put = asyncio.ensure_future(stream.put(_notification(1)))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+
+    stream.close()
+    async with asyncio.timeout(1):
+        await put
+
+    assert stream.drain() == [_notification(0)]
+
+
+async def test_close_ends_iteration() -> None:
+    """Test buffered notifications are read before iteration stops."""
+    async with LMKNotificationStream() as stream:
+        stream.put(_notification(0))
+
+    assert stream.closed
+    assert [notification.title async for notification in stream] == ["0"]
+    assert stream.put(_notification(1)) is None
+    assert stream.qsize() == 0
+    stream.close()
+
+
+async def test_drain_limit() -> None:
+    """Test draining takes at most the given number of notifications."""
+    stream = LMKNotificationStream()
+    for index in range(3):
+        stream.put(_notification(index))
+
+    assert stream.drain(2) == [_notification(0), _notification(1)]
+    assert stream.drain(2) == [_notification(2)]
+    assert stream.drain() == []
+
+
+async def test_several_consumers() -> None:
+    """Test each notification goes to one of several waiting consumers."""
+    stream = LMKNotificationStream()
+    consumers = [asyncio.create_task(anext(stream)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    stream.put(_notification(0))
+    stream.put(_notification(1))
+
+    titles = {notification.title for notification in await asyncio.gather(*consumers)}
+    assert titles == {"0", "1"}
+
+
+async def test_cancelled_consumer_passes_on_wake_up() -> None:
+    """Test a notification for a cancelled consumer goes to the next one."""
+    stream = LMKNotificationStream()
+    first = asyncio.create_task(anext(stream))
+    second = asyncio.create_task(anext(stream))
+    await asyncio.sleep(0)
+
+    stream.put(_notification(0))
+    first.cancel()
+
+    assert await second == _notification(0)
+    assert first.cancelled()
+
+
+async def test_cancelled_consumer_is_skipped() -> None:
+    """Test a consumer cancelled before a notification arrives is skipped."""
+    stream = LMKNotificationStream()
+    first = asyncio.create_task(anext(stream))
+    second = asyncio.create_task(anext(stream))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    stream.put(_notification(0))
+
+    assert await second == _notification(0)
+    assert first.cancelled()
+
+
+async def test_stream_ends_with_connection(connected: Connected) -> None:
+    """Test a stream from a client ends when the connection closes."""
+    listener = await connected(LMKClientType.HEADLESS)
+    sender = await connected()
+    stream = listener.notifications()
+
+    await sender.ws_send_notification(_notification(0), [listener.lmk_user_id])
+    assert (await anext(stream)).title == "0"
+
+    await listener.ws_close()
+    assert [notification async for notification in stream] == []
+    assert stream.closed
+
+
+async def test_stream_ends_when_server_closes(
+    server: LMKTestServer,
+    connected: Connected,
+) -> None:
+    """Test a stream ends when the server closes the connection."""
+    listener = await connected(LMKClientType.HEADLESS)
+    stream = listener.notifications()
+
+    await server.clients[listener.lmk_user_id].close()
+
+    async with asyncio.timeout(5):
+        assert [notification async for notification in stream] == []
+
+
+async def test_closed_stream_is_detached(connected: Connected) -> None:
+    """Test a closed stream no longer receives notifications."""
+    listener = await connected(LMKClientType.HEADLESS)
+    sender = await connected()
+    kept = listener.notifications()
+    closed = listener.notifications()
+
+    closed.close()
+    await sender.ws_send_notification(_notification(0), [listener.lmk_user_id])
+
+    assert (await anext(kept)).title == "0"
+    assert closed.qsize() == 0
+    kept.close()
+    assert not listener._listeners  # noqa: SLF001
+
+
+async def test_close_with_full_blocking_stream(connected: Connected) -> None:
+    """Test closing does not wait on a full stream that is not read."""
+    listener = await connected(LMKClientType.HEADLESS)
+    sender = await connected()
+    stream = listener.notifications(maxsize=1)
+
+    for index in range(3):
+        await sender.ws_send_notification(_notification(index), [listener.lmk_user_id])
+    await _wait_for(lambda: listener.stats.notifications_received == 2)
+
+    async with asyncio.timeout(5):
+        await listener.ws_close()
+
+    assert [notification.title async for notification in stream] == ["0"]
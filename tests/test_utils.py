@@ -0,0 +1,46 @@
+"""Tests for the LetMeKnow utility functions."""
+
+from __future__ import annotations
+
+import pytest
+
+from letmeknowclient import LMKClient, LMKClientType, LMKError, generate_user_id
+from letmeknowclient.utils import connect_client, percentile
+
+
+@pytest.mark.parametrize(
+    ("values", "percent", "expected"),
+    [
+        ([], 50, 0.0),
+        ([3.0], 99, 3.0),
+        ([4.0, 1.0, 3.0, 2.0], 0, 1.0),
+        ([4.0, 1.0, 3.0, 2.0], 50, 2.0),
+        ([4.0, 1.0, 3.0, 2.0], 51, 3.0),
+        ([4.0, 1.0, 3.0, 2.0], 100, 4.0),
+    ],
+)
+def test_percentile(values: list[float], percent: float, expected: float) -> None:
+    """Test the nearest rank percentile of values."""
+    assert percentile(values, percent) == expected
+
+
+def test_generate_user_id() -> None:
+    """Test user IDs start with the client type and are unique."""
+    user_id = generate_user_id(LMKClientType.HEADLESS)
+
+    assert user_id.startswith("headless-")
+    assert user_id != generate_user_id(LMKClientType.HEADLESS)
+
+
+async def test_connect_client_closes_when_not_registered(reject_port: int) -> None:
+    """Test a client failing to register is closed."""
+    async with LMKClient(
+        "127.0.0.1",
+        reject_port,
+        LMKClientType.CLIENT,
+        generate_user_id(LMKClientType.CLIENT),
+    ) as client:
+        with pytest.raises(LMKError, match="Failed to register"):
+            await connect_client(client)
+
+        assert not client.ws_connected